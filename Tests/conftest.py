@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import main_api
+from discovery import DiscoveredURL
+from http_cache import FetchResult
+
+# A post body long enough to pass the prefilter
+ARTICLE_HTML = "<html><head><title>Post</title></head><body>" + "<p>Long enough to pass the prefilter. </p>" * 20 + "</body></html>"
+
+class FakeBlog:
+    """Wires main_api's async blog crawl to fakes through monkeypatch.
+
+    serve() makes the index's feed list `posts`, fetches go through `fetch`
+    (a stand-in for BlogScraper.fetch_page_async; by default every URL
+    answers page()) and `extract` (by default one item per post) runs on a
+    thread pool that is shut down after the test.
+    """
+
+    def __init__(self, monkeypatch, executor):
+        self.monkeypatch = monkeypatch
+        self.executor = executor
+
+    @staticmethod
+    def page(url, status=200, headers=None):
+        return FetchResult(url, status, ARTICLE_HTML, False, None, headers or {})
+
+    @staticmethod
+    def item(url):
+        return {"title": url, "content": "body", "content_type": "blog", "source_url": url, "author": ""}
+
+    def serve(self, posts, fetch=None, extract=None):
+        async def answer(scraper, session, url, kind="page", headers=None):
+            return self.page(url)
+
+        posts = [post if isinstance(post, DiscoveredURL) else DiscoveredURL(post, None) for post in posts]
+        patch = self.monkeypatch.setattr
+        patch(main_api.BlogScraper, "fetch_page_async", fetch or answer)
+        patch(main_api.BlogScraper, "discover_feed_urls", lambda scraper, url, html: posts)
+        patch(main_api, "_extract_post", extract or (lambda url, html, light=False: self.item(url)))
+        patch(main_api, "get_executor", lambda: self.executor)
+        patch(main_api, "async_session", lambda: None)
+        patch(main_api, "http_cache", None)
+
+def _make_pdf(path, page_texts):
+    """Minimal PDF with one line of Helvetica text per page"""
+    n = len(page_texts)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>",
+               b"<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{4 + 2 * i} 0 R" for i in range(n)).encode(), n),
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    for i, text in enumerate(page_texts):
+        stream = b"BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text.encode()
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+                       b"/Contents %d 0 R >>" % (5 + 2 * i))
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+@pytest.fixture
+def make_pdf():
+    return _make_pdf
+
+@pytest.fixture
+def article_html():
+    return ARTICLE_HTML
+
+@pytest.fixture
+def fake_blog(monkeypatch):
+    with ThreadPoolExecutor(6) as executor:
+        yield FakeBlog(monkeypatch, executor)
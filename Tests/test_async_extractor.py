@@ -0,0 +1,74 @@
+import asyncio
+
+import async_extractor
+import http_client
+
+def test_session_opened_for_a_call_is_closed_and_shared_one_is_kept(monkeypatch):
+    used = []
+
+    async def fake_fetch_and_extract(session, url, semaphore=None, executor=None, seen=None):
+        used.append(session)
+        return []
+
+    monkeypatch.setattr(async_extractor, "fetch_and_extract", fake_fetch_and_extract)
+
+    async def run():
+        await async_extractor.extract_from_urls_async(["https://a.example.com/p/1"])
+        opened_for_call = used[-1]
+        shared = async_extractor.async_session()
+        await async_extractor.extract_from_urls_async(["https://a.example.com/p/2"])
+        assert used[-1] is shared and not shared.closed
+        await http_client.close_async_session()
+        return opened_for_call
+
+    assert asyncio.run(run()).closed
+
+def test_sessions_of_closed_loops_are_dropped():
+    async def leave_open():
+        return http_client.get_async_session(async_extractor.CONFIG)
+
+    async def open_and_close():
+        http_client.get_async_session(async_extractor.CONFIG)
+        assert http_client.has_async_session()
+        count = len(http_client._async_sessions)
+        await http_client.close_async_session()
+        return count
+
+    leaked = asyncio.run(leave_open())
+    assert asyncio.run(open_and_close()) == 1
+    assert http_client._async_sessions == {}
+    leaked.detach()  # its loop is gone and it never opened a connection
+
+def test_overlapping_calls_never_close_a_session_still_in_use(monkeypatch):
+    first_done = None
+    states = []
+
+    async def fake_fetch_and_extract(session, url, semaphore=None, executor=None, seen=None):
+        if url.endswith("/slow"):
+            await first_done.wait()
+            states.append(session.closed)
+        return []
+
+    monkeypatch.setattr(async_extractor, "fetch_and_extract", fake_fetch_and_extract)
+
+    async def run():
+        nonlocal first_done
+        first_done = asyncio.Event()
+
+        async def fast():
+            await async_extractor.extract_from_urls_async(["https://a.example.com/fast"])
+            first_done.set()
+
+        # Without a shared session each call gets (and closes) its own
+        await asyncio.gather(async_extractor.extract_from_urls_async(["https://a.example.com/slow"]), fast())
+        assert not http_client.has_async_session()
+
+        # With one, both use it and neither closes it
+        first_done = asyncio.Event()
+        shared = async_extractor.async_session()
+        await asyncio.gather(async_extractor.extract_from_urls_async(["https://a.example.com/slow"]), fast())
+        assert not shared.closed
+        await http_client.close_async_session()
+
+    asyncio.run(run())
+    assert states == [False, False]
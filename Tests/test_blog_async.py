@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import main_api
+
+INDEX = "https://blog.example.com/"
+POSTS = [f"https://blog.example.com/blog/post-{i}" for i in range(6)]
+
+def test_posts_are_fetched_concurrently_and_extraction_leaves_the_loop_free(fake_blog):
+    in_flight = peak = 0
+
+    async def fake_fetch(self, session, url, kind="page", headers=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.1)
+        in_flight -= 1
+        return fake_blog.page(url)
+
+    def slow_extract(url, html, light=False):
+        time.sleep(0.2)  # CPU-bound stand-in; must not run on the event loop
+        return fake_blog.item(url)
+
+    fake_blog.serve(POSTS, fetch=fake_fetch, extract=slow_extract)
+
+    async def crawl():
+        gaps, done = [], False
+
+        async def ticker():
+            last = time.monotonic()
+            while not done:
+                await asyncio.sleep(0.01)
+                now = time.monotonic()
+                gaps.append(now - last)
+                last = now
+
+        tick = asyncio.ensure_future(ticker())
+        started = time.monotonic()
+        items = [item async for item in main_api.scraper.iter_blog_async(INDEX, max_concurrent=3)]
+        elapsed = time.monotonic() - started
+        done = True
+        await tick
+        return items, elapsed, max(gaps)
+
+    items, elapsed, longest_gap = asyncio.run(crawl())
+
+    assert sorted(item.source_url for item in items) == POSTS
+    assert peak == 3
+    # Sequential fetch + extract would take 6 * 0.3s
+    assert elapsed < 1.0
+    assert longest_gap < 0.1
+
+def test_resumed_crawl_skips_posts_that_already_have_items(fake_blog):
+    fetched = []
+
+    async def fake_fetch(self, session, url, kind="page", headers=None):
+        fetched.append(url)
+        return fake_blog.page(url)
+
+    fake_blog.serve(POSTS, fetch=fake_fetch)
+
+    async def crawl(stats):
+        return [item async for item in main_api.scraper.iter_blog_async(INDEX, stats=stats,
+                                                                        skip_urls=frozenset(POSTS[:4]))]
+
+    stats = {}
+    items = asyncio.run(crawl(stats))
+
+    assert sorted(item.source_url for item in items) == POSTS[4:]
+    assert sorted(fetched) == [INDEX] + POSTS[4:]
+    assert stats["discovered"] == 6 and stats["done"] == 6
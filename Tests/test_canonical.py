@@ -0,0 +1,27 @@
+from canonical import SeenURLs, canonical_link, canonicalize_url, url_key
+
+def test_canonicalize_url():
+    assert canonicalize_url("HTTPS://Blog.Example.com:443//posts/./hello/?utm_source=x&b=2&a=1&fbclid=y#top") \
+        == "https://blog.example.com/posts/hello/?a=1&b=2"
+    assert canonicalize_url("https://example.com/p/./post") == "https://example.com/p/post"
+    assert canonicalize_url("http://example.com:8080") == "http://example.com:8080/"
+
+def test_url_key_ignores_scheme_and_www():
+    assert url_key("http://www.example.com/p/post/") == url_key("https://example.com/p/post?utm_medium=rss")
+
+def test_content_parameters_are_kept():
+    assert canonicalize_url("https://example.com/?s=graphs&ref=v2&share=1&r=3") \
+        == "https://example.com/?r=3&ref=v2&s=graphs&share=1"
+
+def test_canonical_link():
+    html = '<head><link href="/p/original" rel="canonical"></head>'
+    assert canonical_link("https://example.com/p/copy", html) == "https://example.com/p/original"
+    assert canonical_link("https://example.com/", "<p>none</p>") is None
+
+def test_seen_urls_claims_redirects_and_canonicals():
+    seen = SeenURLs()
+    assert seen.claim("https://a.com/post")
+    assert not seen.claim("https://www.a.com/post/?utm_medium=rss")
+    assert seen.claim_aliases("https://a.com/post", "https://a.com/post", "https://a.com/canonical")
+    assert seen.claim("https://a.com/amp/post")
+    assert not seen.claim_aliases("https://a.com/amp/post", None, "https://a.com/canonical")
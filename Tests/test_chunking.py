@@ -0,0 +1,27 @@
+from chunking import Chunker, iter_chunks
+
+def test_chunks_break_at_paragraphs_then_sentences():
+    text = "First paragraph.\n\nSecond one. It has two sentences.\n\n" + "Long sentence here. " * 20
+    chunks = list(iter_chunks(text, max_size=60))
+    assert chunks[0] == "First paragraph.\n\nSecond one. It has two sentences."
+    assert all(len(chunk) <= 60 and chunk.endswith(".") for chunk in chunks)
+
+def test_overlap_repeats_trailing_sentences():
+    chunks = list(iter_chunks("One. Two. Three. Four. Five. Six.", max_size=20, overlap=10))
+    assert chunks[0] == "One. Two. Three."
+    assert chunks[1].startswith("Three.")
+
+def test_token_budget_and_tags():
+    words = lambda text: len(text.split())
+    chunker = Chunker(max_size=5, length=words)
+    chunks = list(chunker.feed("a b c\n\nd e f", tag=1)) + list(chunker.feed("g h", tag=2))
+    chunks.append(chunker.flush())
+    assert [chunk.text for chunk in chunks] == ["a b c", "d e f\n\ng h"]
+    assert (chunks[1].first, chunks[1].last) == (1, 2)
+
+def test_oversized_word_is_cut_into_max_size_pieces():
+    word = "x" * 200_005
+    chunks = list(iter_chunks(f"Short. {word}", max_size=100))
+    assert chunks[0] == "Short."
+    assert "".join(chunks[1:]) == word
+    assert all(len(chunk) == 100 for chunk in chunks[1:-1]) and len(chunks[-1]) == 5
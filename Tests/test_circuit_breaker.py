@@ -0,0 +1,74 @@
+import socket
+
+import pytest
+import requests
+
+import metrics
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from http_client import build_session
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def open_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=30, clock=clock)
+    for _ in range(3):
+        breaker.check("https://down.example.com/p/1")
+        breaker.record_failure("https://down.example.com/p/1")
+    return breaker
+
+def test_consecutive_failures_open_only_that_host():
+    breaker = open_breaker(Clock())
+    rejected = metrics.get("circuit_breaker", "rejected")
+
+    assert breaker.state("https://down.example.com/") == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check("https://down.example.com/p/2")
+    assert metrics.get("circuit_breaker", "rejected") - rejected == 1
+    breaker.check("https://up.example.com/p/1")
+    assert breaker.states() == {"down.example.com": OPEN}
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=3, clock=Clock())
+    for _ in range(5):
+        breaker.record_failure("https://flaky.example.com/a")
+        breaker.record_success("https://flaky.example.com/b")
+    assert breaker.state("https://flaky.example.com/") == CLOSED
+
+def test_half_open_lets_one_probe_through_after_cooldown():
+    clock = Clock()
+    breaker = open_breaker(clock)
+    clock.now = 31
+
+    assert not breaker.is_open("https://down.example.com/p/2")
+    breaker.check("https://down.example.com/p/2")
+    assert breaker.state("https://down.example.com/") == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check("https://down.example.com/p/3")
+
+    breaker.record_failure("https://down.example.com/p/2")
+    assert breaker.state("https://down.example.com/") == OPEN
+    clock.now = 62
+    breaker.check("https://down.example.com/p/3")
+    breaker.record_success("https://down.example.com/p/3")
+    assert breaker.state("https://down.example.com/") == CLOSED
+    assert breaker.states() == {}
+
+def test_session_fails_fast_once_a_dead_host_trips_the_breaker():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        dead = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=60)
+    session = build_session({'max_retries': 0, 'http_backoff_factor': 0, 'http_pool_hosts': 2,
+                             'http_pool_per_host': 2, 'http_pool_block': False}, breaker=breaker)
+
+    for i in range(2):
+        with pytest.raises(requests.ConnectionError) as error:
+            session.get(f"{dead}/p/{i}", timeout=2)
+        assert not isinstance(error.value, CircuitOpenError)
+    with pytest.raises(CircuitOpenError):
+        session.get(f"{dead}/p/2", timeout=2)
@@ -0,0 +1,118 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from concurrency import AdaptiveConcurrency
+
+URL = "https://blog.example.com/p/1"
+
+def throttled():
+    return aiohttp.ClientResponseError(None, (), status=429)
+
+async def fetch(controller, seconds=0.0, error=None):
+    async with controller.slot(URL):
+        await asyncio.sleep(seconds)
+        if error:
+            raise error
+
+async def attempt(controller, error):
+    try:
+        await fetch(controller, 0.01, error)
+    except aiohttp.ClientResponseError:
+        pass
+
+def test_healthy_fetches_grow_the_limit_up_to_the_ceiling_when_saturated():
+    controller = AdaptiveConcurrency(initial=2, floor=1, ceiling=4)
+
+    async def run():
+        for _ in range(20):
+            await asyncio.gather(*(fetch(controller, 0.001) for _ in range(8)))
+
+    asyncio.run(run())
+    assert controller.limits() == {"blog.example.com": 4}
+
+def test_sequential_fetches_do_not_raise_the_limit():
+    controller = AdaptiveConcurrency(initial=2, floor=1, ceiling=8)
+
+    async def run():
+        for _ in range(50):
+            await fetch(controller)
+
+    asyncio.run(run())
+    assert controller.limits() == {"blog.example.com": 2}
+
+def test_burst_of_429s_cuts_the_limit_once():
+    controller = AdaptiveConcurrency(initial=8, floor=1, ceiling=16)
+
+    async def run():
+        await asyncio.gather(*(attempt(controller, throttled()) for _ in range(8)))
+
+    asyncio.run(run())
+    assert controller.limits() == {"blog.example.com": 4}
+
+def test_not_found_leaves_the_limit_alone():
+    controller = AdaptiveConcurrency(initial=4)
+
+    async def run():
+        with pytest.raises(aiohttp.ClientResponseError):
+            await fetch(controller, error=aiohttp.ClientResponseError(None, (), status=404))
+
+    asyncio.run(run())
+    assert controller.limits() == {"blog.example.com": 4}
+
+def test_latency_spike_cuts_and_floor_holds():
+    controller = AdaptiveConcurrency(initial=2, floor=2, ceiling=8, latency_spike=3.0)
+
+    async def run():
+        for _ in range(3):
+            await asyncio.gather(fetch(controller, 0.005), fetch(controller, 0.005))
+        before = controller.limits()["blog.example.com"]
+        await fetch(controller, 0.2)
+        return before
+
+    before = asyncio.run(run())
+    assert before > 2
+    assert controller.limits() == {"blog.example.com": 2}
+
+def test_in_flight_never_exceeds_the_limit():
+    controller = AdaptiveConcurrency(initial=3, floor=1, ceiling=3)
+    in_flight = peak = 0
+
+    async def tracked():
+        nonlocal in_flight, peak
+        async with controller.slot(URL):
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    async def run():
+        await asyncio.gather(*(tracked() for _ in range(12)))
+
+    asyncio.run(run())
+    assert peak == 3
+
+def test_waiter_cancelled_as_a_slot_frees_up():
+    controller = AdaptiveConcurrency(initial=1, floor=1, ceiling=1)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def holder():
+            async with controller.slot(URL):
+                await release.wait()
+
+        first = asyncio.ensure_future(holder())
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(fetch(controller))
+        await asyncio.sleep(0)
+        # The holder releases (and wakes the waiter) before the cancellation is delivered
+        release.set()
+        waiting.cancel()
+        await first
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        await asyncio.wait_for(fetch(controller), 1)
+
+    asyncio.run(run())
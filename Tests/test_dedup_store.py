@@ -0,0 +1,22 @@
+from dedup_store import MemoryDedupStore, SQLiteDedupStore
+
+def test_memory_store_is_bounded():
+    store = MemoryDedupStore(max_entries=2)
+    assert store.add_if_new("a")
+    assert not store.add_if_new("a")
+    store.add_if_new("b")
+    store.add_if_new("c")
+    assert len(store) == 2
+    assert "a" not in store
+
+def test_sqlite_store_persists_across_instances(tmp_path):
+    path = str(tmp_path / "dedup.db")
+    store = SQLiteDedupStore(path, batch_size=10)
+    assert store.add_if_new("hash-1")
+    assert not store.add_if_new("hash-1")  # still only in the pending batch
+    store.close()
+
+    reopened = SQLiteDedupStore(path)
+    assert "hash-1" in reopened
+    assert not reopened.add_if_new("hash-1")
+    reopened.close()
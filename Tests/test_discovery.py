@@ -0,0 +1,62 @@
+from io import BytesIO
+
+from discovery import discover_urls, feed_links, parse_feed
+
+SITEMAP_INDEX = b"""<?xml version="1.0"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://example.com/sitemap-blog.xml</loc></sitemap>
+</sitemapindex>"""
+
+SITEMAP = b"""<?xml version="1.0"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://example.com/blog/old</loc><lastmod>2023-01-01</lastmod></url>
+  <url><loc>https://example.com/blog/new</loc><lastmod>2024-05-01T10:00:00Z</lastmod></url>
+  <url><loc>https://example.com/pricing</loc></url>
+</urlset>"""
+
+RSS = b"""<rss><channel>
+  <item><link>https://x.substack.com/p/hello</link><pubDate>Tue, 07 May 2024 10:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+class FakeRaw(BytesIO):
+    decode_content = False
+
+class FakeResponse:
+    def __init__(self, body):
+        self.status_code = 200 if body is not None else 404
+        self.raw = FakeRaw(body or b"")
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+class FakeSession:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, url, **kwargs):
+        return FakeResponse(self.pages.get(url))
+
+def test_parse_rss_dates():
+    urls, sitemaps = parse_feed(BytesIO(RSS))
+    assert urls[0].url == "https://x.substack.com/p/hello"
+    assert urls[0].lastmod.startswith("2024-05-07T10:00:00")
+    assert sitemaps == []
+
+def test_sitemap_index_is_followed_and_filtered_to_blog():
+    session = FakeSession({
+        "https://example.com/sitemap.xml": SITEMAP_INDEX,
+        "https://example.com/sitemap-blog.xml": SITEMAP,
+    })
+    found = discover_urls("https://example.com/blog", session)
+    assert [item.url for item in found] == ["https://example.com/blog/new", "https://example.com/blog/old"]
+
+def test_feed_links_from_html_and_substack():
+    html = '<link rel="alternate" type="application/rss+xml" href="/rss.xml">'
+    assert feed_links("https://example.com/blog", html) == ["https://example.com/rss.xml"]
+    assert feed_links("https://x.substack.com", "") == ["https://x.substack.com/feed"]
@@ -0,0 +1,21 @@
+from document import ParsedDocument
+from extractor import detect_content_type_advanced
+
+HTML = (
+    '<html><head><title> Hello </title><meta name="author" content="Aline">'
+    '<meta property="og:type" content="video"><meta name="twitter:card" content="summary"></head>'
+    "<body><p>Body</p></body></html>"
+)
+
+def test_metadata_lookups():
+    doc = ParsedDocument.from_html(HTML)
+    assert doc.title == "Hello"
+    assert doc.author == "Aline"
+    assert doc.og_type == "video"
+    assert doc.twitter_card == "summary"
+    assert doc.schema_itemtype == ""
+
+def test_content_type_accepts_parsed_document():
+    doc = ParsedDocument.from_html(HTML)
+    assert detect_content_type_advanced("https://example.com/p/x", doc) == "video"
+    assert detect_content_type_advanced("https://example.com/p/x", "<html><body></body></html>") == "blog"
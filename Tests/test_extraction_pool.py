@@ -0,0 +1,31 @@
+import extractor
+from extraction_pool import extract_article
+
+PAGE = (
+    '<html><head><title>Graphs</title><meta name="author" content="Aline"></head><body><article>'
+    + "<p>Breadth-first search explores a graph level by level using a queue of frontier nodes.</p>"
+    + "<p>Depth-first search instead follows one branch as far as possible before backtracking.</p>"
+    + "<p>Dijkstra's algorithm generalizes BFS to weighted edges with a priority queue keyed by distance.</p>"
+    + "<p>Topological sorting orders a directed acyclic graph so every edge points forward.</p>"
+    + "<p>Union-find answers connectivity questions quickly once edges arrive incrementally.</p>"
+    + "</article></body></html>"
+)
+
+TAGGED_PAGE = PAGE.replace("<head>", '<head><meta property="og:type" content="article">')
+
+def test_extract_article_returns_item():
+    item, reason = extract_article("https://example.com/blog/graphs", PAGE)
+    assert item["title"] == "Graphs"
+    assert item["author"] == "Aline"
+    assert "Breadth-first search" in item["content"]
+    assert reason is None
+
+def test_extract_article_rejects_short_pages():
+    item, reason = extract_article("https://example.com/blog/empty", "<html><body><p>Hi</p></body></html>")
+    assert item is None
+    assert reason
+
+def test_pool_and_sync_extraction_build_the_same_item():
+    item, _ = extract_article("https://example.com/blog/graphs", TAGGED_PAGE)
+    assert item["content_type"] == "article"
+    assert extractor._extract_article_html("https://example.com/blog/graphs", TAGGED_PAGE) == [item]
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import pytest
+from lxml import html as lxml_html
+
+import extractor
+import main_api
+import metrics
+
+URL = "https://example.com/blog/system-design"
+PAGE = "<html><head><title>System design notes</title></head><body>" + "".join(
+    f"<p>Note {i}: size queue {i} for peak load, cache hot keys near readers, and shed work early.</p>"
+    for i in range(12)
+) + "</body></html>"
+
+class FakeResponse:
+    def __init__(self, url, text):
+        self.url = url
+        self.status_code = 200
+        self.text = text
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+class FakeSession:
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.urls.append(url)
+        return FakeResponse(url, PAGE)
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(extractor, "session", session)
+    monkeypatch.setattr(extractor, "http_cache", None)
+    monkeypatch.setattr(extractor, "_drop_duplicates", lambda url, items: items)
+    monkeypatch.setattr(main_api, "http_session", session)
+    monkeypatch.setattr(main_api, "http_cache", None)
+    return session
+
+def test_fallback_reuses_the_fetched_body_and_tree(fake_session, monkeypatch):
+    docs = []
+    extract_paragraphs = extractor._extract_paragraphs
+
+    def spy(url, html, doc=None):
+        docs.append(doc)
+        return extract_paragraphs(url, html, doc)
+
+    monkeypatch.setattr(extractor, "_article_items", lambda url, article, doc: [])
+    monkeypatch.setattr(extractor, "_extract_paragraphs", spy)
+    before = metrics.get("http_requests", "fallback")
+
+    items = extractor.extract_with_fallback(URL)
+
+    assert fake_session.urls == [URL]
+    assert metrics.get("http_requests", "fallback") - before == 1
+    assert docs[0] is not None and docs[0].tree is not None
+    assert items[0]["title"] == "System design notes"
+
+def test_blog_scraper_fetches_and_parses_once_when_goose_comes_up_empty(fake_session, monkeypatch):
+    scraper = main_api.BlogScraper()
+
+    def goose_extract(raw_html):
+        assert raw_html == PAGE
+        return SimpleNamespace(cleaned_text="", raw_doc=lxml_html.fromstring(raw_html), raw_html=raw_html)
+
+    def parse_again(cls, html):
+        pytest.fail("the fallback parsed the body again instead of reusing Goose's tree")
+
+    monkeypatch.setattr(scraper.goose, "extract", goose_extract)
+    monkeypatch.setattr(main_api.ParsedDocument, "from_html", classmethod(parse_again))
+
+    item = scraper.scrape_single_url(URL)
+
+    assert fake_session.urls == [URL]
+    assert item is not None and "Note 11" in item.content
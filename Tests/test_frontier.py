@@ -0,0 +1,62 @@
+import extractor
+from frontier import CrawlFrontier, VisitedSet, classify_link
+from http_cache import FetchResult
+
+def test_classify_links():
+    assert classify_link("https://a.com/blog/page/2") == ("index", 0.9)
+    assert classify_link("https://a.com/blog?page=3") == ("index", 0.9)
+    assert classify_link("https://a.com/x", "Older posts") == ("index", 0.9)
+    assert classify_link("https://x.substack.com/p/hello")[0] == "article"
+    assert classify_link("https://a.com/pricing") == (None, 0)
+
+def test_frontier_orders_by_score_and_limits_depth():
+    frontier = CrawlFrontier(max_depth=2)
+    frontier.push("https://a.com/blog/old", 1, "article", lastmod="2001-01-01T00:00:00+00:00")
+    frontier.push("https://a.com/blog/fresh", 1, "article", lastmod="2999-01-01T00:00:00+00:00")
+    frontier.push("https://a.com/blog/page/2", 1, "index", 0.9)
+    assert not frontier.push("https://a.com/blog/deep", 3, "article")
+    assert not frontier.push("https://a.com/blog/fresh/#comments", 1, "article")
+    assert [frontier.pop().url for _ in range(3)] == [
+        "https://a.com/blog/fresh", "https://a.com/blog/old", "https://a.com/blog/page/2"
+    ]
+
+def test_index_pages_at_max_depth_are_not_queued():
+    frontier = CrawlFrontier(max_depth=2)
+    assert frontier.push("https://a.com/blog/post", 2, "article")
+    assert not frontier.push("https://a.com/tag/python", 2, "index")
+    assert frontier.push("https://a.com/tag/go", 1, "index")
+
+def blog_page(n, last):
+    posts = "".join(f'<a href="/blog/post-{n}-{i}">Post {n}.{i}</a>' for i in range(2))
+    older = "" if n == last else f'<a href="/blog/page/{n + 1}">Older posts</a>'
+    category = '<a href="/category/news">News</a>' if n == 1 else ""
+    return f"<html><body>{posts}{older}{category}</body></html>"
+
+def test_pagination_is_followed_without_spending_depth(monkeypatch):
+    pages = {"https://a.com/blog": blog_page(1, 3),
+             "https://a.com/blog/page/2": blog_page(2, 3),
+             "https://a.com/blog/page/3": blog_page(3, 3),
+             "https://a.com/category/news": '<a href="/category/news/sub">Sub</a><a href="/blog/news-1">N</a>'}
+    fetched = []
+
+    def fake_fetch(url, kind="page", headers=None):
+        fetched.append(url)
+        return FetchResult(url, 200, pages[url], False, None, {})
+
+    monkeypatch.setitem(extractor.CONFIG, "crawl_max_depth", 2)
+    monkeypatch.setattr(extractor, "fetch_page", fake_fetch)
+    monkeypatch.setattr(extractor, "discover_urls", lambda *args: [])
+    monkeypatch.setattr(extractor.scheduler, "wait", lambda url: None)
+
+    links = {link.url for link in extractor.discover_article_links("https://a.com/blog", max_links=50)}
+
+    assert links == {f"https://a.com/blog/post-{n}-{i}" for n in (1, 2, 3) for i in range(2)} | {"https://a.com/blog/news-1"}
+    # The category page is a leaf at max depth: its own index links are never fetched
+    assert sorted(fetched) == sorted(pages)
+
+def test_visited_set_switches_to_bloom_filter():
+    visited = VisitedSet(exact_limit=2)
+    for i in range(100):
+        visited.add(f"https://a.com/p/{i}")
+    assert all(f"https://a.com/p/{i}" in visited for i in range(100))
+    assert len(visited._exact) == 2
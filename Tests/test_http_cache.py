@@ -0,0 +1,51 @@
+from http_cache import HTTPCache, cached_get
+
+class FakeResponse:
+    def __init__(self, url, status_code, text="", headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+class FakeSession:
+    """Serves one page with an ETag and answers 304 when it is sent back"""
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(headers or {})
+        if (headers or {}).get("If-None-Match") == '"v1"':
+            return FakeResponse(url, 304)
+        return FakeResponse(url, 200, "<html>post</html>", {"ETag": '"v1"'})
+
+def test_304_returns_cached_body_and_items(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    session = FakeSession()
+    first = cached_get(session, "https://example.com/p/1", cache, "article")
+    assert not first.not_modified and first.items is None
+    cache.store_items("https://example.com/p/1", "article", [{"title": "Post"}])
+
+    second = cached_get(session, "https://example.com/p/1", cache, "article")
+    assert session.requests[-1]["If-None-Match"] == '"v1"'
+    assert second.not_modified
+    assert second.text == "<html>post</html>"
+    assert second.items == [{"title": "Post"}]
+
+def test_lru_eviction_respects_size_cap(tmp_path):
+    cache = HTTPCache(str(tmp_path), max_bytes=1)
+    cache.store("https://example.com/a", "a" * 100, {"ETag": "a"})
+    cache.store("https://example.com/b", "b" * 100, {"ETag": "b"})
+    assert cache.conditional_headers("https://example.com/a") == {}
+
+def test_running_size_total_tracks_replacements_items_and_deletes(tmp_path):
+    cache = HTTPCache(str(tmp_path), max_bytes=10 ** 6)
+    cache.store("https://example.com/a", "a" * 100, {"ETag": "a1"})
+    cache.store("https://example.com/a", "a" * 500, {"ETag": "a2"})
+    cache.store("https://example.com/b", "b" * 100, {"ETag": "b"})
+    cache.store_items("https://example.com/b", "article", [{"title": "B"}])
+    cache.store("https://example.com/b", "b", {})
+    assert cache._total == cache._count_size() > 0
+    assert HTTPCache(str(tmp_path))._total == cache._total
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+import pytest
+
+import metrics
+from http_client import AsyncRetry, build_session, get_with_retry, retry_after_seconds
+
+CONFIG = {
+    'max_retries': 2,
+    'http_backoff_factor': 0,
+    'http_pool_hosts': 4,
+    'http_pool_per_host': 2,
+    'http_pool_block': True,
+}
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    failures = {}
+
+    def do_GET(self):
+        if self.path.startswith("/flaky") and Handler.failures.setdefault(self.path, 0) < 1:
+            Handler.failures[self.path] += 1
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "4")
+            self.end_headers()
+            self.wfile.write(b"busy")
+            return
+        if self.path.startswith("/throttled"):
+            self.send_response(429)
+            self.send_header("Retry-After", "120")
+            self.send_header("Content-Length", "4")
+            self.end_headers()
+            self.wfile.write(b"busy")
+            return
+        self._reply(200, self.headers.get("Accept-Encoding", "").encode())
+
+    def _reply(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_requests_reuse_one_kept_alive_connection(server):
+    session = build_session(CONFIG)
+    opened = metrics.get("http_pool", "connections_opened")
+    sent = metrics.get("http_pool", "requests")
+
+    for _ in range(3):
+        assert "gzip" in session.get(f"{server}/page", timeout=5).text
+
+    assert metrics.get("http_pool", "connections_opened") - opened == 1
+    assert metrics.get("http_pool", "requests") - sent == 3
+
+def test_retries_transient_errors(server):
+    session = build_session(CONFIG)
+    sent = metrics.get("http_pool", "requests")
+
+    assert session.get(f"{server}/flaky", timeout=5).status_code == 200
+    assert metrics.get("http_pool", "requests") - sent == 2
+
+def test_async_retry_honors_retry_after_and_counts_by_host(server):
+    host = server.split("://")[1]
+    retries = metrics.get("http_retries", host)
+
+    async def fetch():
+        async with aiohttp.ClientSession() as session:
+            async with get_with_retry(session, f"{server}/flaky-async", AsyncRetry(backoff_factor=60)) as response:
+                return response.status
+
+    # Retry-After: 0 overrides the (huge) exponential backoff
+    assert asyncio.run(asyncio.wait_for(fetch(), 5)) == 200
+    assert metrics.get("http_retries", host) - retries == 1
+
+def test_async_retry_gives_up_when_retry_after_exceeds_the_cap(server):
+    host = server.split("://")[1]
+    retries = metrics.get("http_retries", host)
+
+    async def fetch():
+        async with aiohttp.ClientSession() as session:
+            async with get_with_retry(session, f"{server}/throttled", AsyncRetry(max_backoff=5)) as response:
+                return response.status
+
+    # Retrying after 5s instead of the 120s asked for would ignore the server
+    assert asyncio.run(asyncio.wait_for(fetch(), 5)) == 429
+    assert metrics.get("http_retries", host) == retries
+
+def test_retry_after_parsing():
+    assert retry_after_seconds("7") == 7
+    assert retry_after_seconds(None) is None
+    assert retry_after_seconds("soon") is None
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < retry_after_seconds(later) <= 30
+
+def test_backoff_is_jittered_and_capped():
+    retry = AsyncRetry(backoff_factor=1, max_backoff=5)
+    delays = [retry.backoff(2) for _ in range(200)]
+    assert all(0 <= delay <= 4 for delay in delays)
+    assert len(set(delays)) > 1
+    assert retry.backoff(10) <= 5
+    assert retry.backoff(0, retry_after="3") == 3
+    assert retry.backoff(0, retry_after="120") is None
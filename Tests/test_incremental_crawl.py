@@ -0,0 +1,78 @@
+import asyncio
+
+import requests
+
+import extractor
+import main_api
+from dedup_store import MemoryDedupStore
+from discovery import DiscoveredURL
+from http_cache import FetchResult
+
+LINKS = [DiscoveredURL("https://blog.example.com/a", "2024-01-01"),
+         DiscoveredURL("https://blog.example.com/b", "2024-01-02")]
+
+def crawl_twice(monkeypatch, tmp_path, article_html, down=(), broken=()):
+    """Two incremental sync crawls; `down` URLs fail to fetch and `broken` ones to extract, the first time only"""
+    fetched, down, broken = [], set(down), set(broken)
+
+    def fake_fetch(url, kind="page", headers=None):
+        fetched.append(url)
+        if url in down:
+            raise requests.ConnectionError("refused")
+        return FetchResult(url, 200, article_html, False, None, {})
+
+    def fake_extract(url, html):
+        if url in broken:
+            raise ValueError("parser crashed")
+        return [{"title": url, "content": url, "content_type": "blog", "source_url": url, "author": ""}]
+
+    monkeypatch.setitem(extractor.CONFIG, "checkpoint_file", str(tmp_path / "checkpoint.json"))
+    monkeypatch.setattr(extractor, "discover_article_links", lambda url, max_links: LINKS)
+    monkeypatch.setattr(extractor, "fetch_page", fake_fetch)
+    monkeypatch.setattr(extractor, "http_cache", None)
+    monkeypatch.setattr(extractor, "dedup_store", MemoryDedupStore())
+    monkeypatch.setattr(extractor, "near_dup_index", None)
+    monkeypatch.setattr(extractor.scheduler, "wait", lambda url: None)
+    monkeypatch.setattr(extractor, "_extract_article_html", fake_extract)
+
+    first = extractor.extract_from_blog_index("https://blog.example.com/", incremental=True)
+    down.clear()
+    broken.clear()
+    fetched.clear()
+    second = extractor.extract_from_blog_index("https://blog.example.com/", incremental=True)
+    return first, fetched, second
+
+def test_lastmod_is_saved_only_for_posts_that_were_fetched(monkeypatch, tmp_path, article_html):
+    first, fetched, second = crawl_twice(monkeypatch, tmp_path, article_html, down={"https://blog.example.com/b"})
+
+    assert [item["source_url"] for item in first] == ["https://blog.example.com/a"]
+    assert fetched == ["https://blog.example.com/b"]
+    assert [item["source_url"] for item in second] == ["https://blog.example.com/b"]
+
+def test_lastmod_is_not_saved_when_extraction_fails(monkeypatch, tmp_path, article_html):
+    first, fetched, second = crawl_twice(monkeypatch, tmp_path, article_html, broken={"https://blog.example.com/b"})
+
+    assert [item["source_url"] for item in first] == ["https://blog.example.com/a"]
+    assert fetched == ["https://blog.example.com/b"]
+    assert [item["source_url"] for item in second] == ["https://blog.example.com/b"]
+
+def test_not_modified_post_saves_its_new_lastmod(monkeypatch, tmp_path, fake_blog):
+    url = "https://blog.example.com/a"
+    monkeypatch.setitem(main_api.CONFIG, "checkpoint_file", str(tmp_path / "checkpoint.json"))
+    main_api.save_url_records({url: {"lastmod": "2024-01-01", "etag": '"v1"'}}, main_api.CONFIG['checkpoint_file'])
+    fetched = []
+
+    async def fetch(self, session, fetch_url, kind="page", headers=None):
+        if fetch_url == url:
+            fetched.append(fetch_url)
+            return fake_blog.page(fetch_url, status=304, headers={"ETag": '"v1"'})
+        return fake_blog.page(fetch_url)
+
+    # The sitemap date moved but the ETag did not
+    fake_blog.serve([DiscoveredURL(url, "2024-02-01")], fetch=fetch)
+
+    async def crawl():
+        return [item async for item in main_api.scraper.iter_blog_async("https://blog.example.com/", incremental=True)]
+
+    assert asyncio.run(crawl()) == [] and fetched == [url]
+    assert asyncio.run(crawl()) == [] and fetched == [url]
@@ -0,0 +1,122 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import main_api
+from jobs import JobStore, QUEUED, SUCCEEDED
+
+def test_items_are_paged_in_order(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job_id = store.create({"url": "https://example.com/blog"})
+    for i in range(5):
+        store.add_item(job_id, {"title": f"Post {i}"})
+    assert [item["title"] for item in store.get_items(job_id, offset=2, limit=2)] == ["Post 2", "Post 3"]
+    assert store.count_items(job_id) == 5
+
+def test_interrupted_jobs_keep_their_items_and_are_claimed_again(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = JobStore(path, lease_seconds=0.05, worker_id="dead")
+    job_id = store.create({"url": "https://example.com/blog"})
+    assert store.claim(job_id)
+    store.add_item(job_id, {"title": "partial", "source_url": "https://example.com/blog/a"})
+    store.close()
+
+    restarted = JobStore(path, worker_id="new")
+    assert restarted.claimable() == []
+    time.sleep(0.1)
+    assert restarted.claimable() == [job_id]
+    assert restarted.claim(job_id)
+    assert restarted.count_items(job_id) == 1
+    assert restarted.done_urls(job_id) == {"https://example.com/blog/a"}
+
+def test_only_one_worker_claims_a_job(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    first = JobStore(path, worker_id="first")
+    second = JobStore(path, worker_id="second")
+    job_id = first.create({"url": "https://example.com/blog"})
+
+    assert first.claim(job_id)
+    assert not second.claim(job_id)
+    assert not second.renew(job_id)
+    assert not second.finish(job_id, SUCCEEDED)
+    assert first.renew(job_id)
+    assert first.finish(job_id, SUCCEEDED)
+    assert first.get(job_id)["status"] == SUCCEEDED
+    assert second.claimable() == []
+
+def test_released_job_is_claimable_at_once(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    first = JobStore(path, worker_id="first")
+    second = JobStore(path, worker_id="second")
+    job_id = first.create({"url": "https://example.com/blog"})
+
+    assert first.claim(job_id)
+    assert not second.release(job_id)
+    assert first.release(job_id)
+    assert second.claimable() == [job_id]
+    assert second.claim(job_id)
+
+@pytest.fixture
+def job_api(monkeypatch, tmp_path):
+    """main_api's job workers on a fresh store, crawling through `crawl` (set by the test)"""
+    path = str(tmp_path / "jobs.db")
+    api = SimpleNamespace(path=path, crawl=None)
+
+    async def iter_job_items(job_id, params, stats):
+        async for item in api.crawl(stats):
+            yield item
+
+    monkeypatch.setattr(main_api, "job_store", JobStore(path, lease_seconds=300))
+    monkeypatch.setattr(main_api, "job_queue", asyncio.Queue())
+    monkeypatch.setattr(main_api, "job_workers", [])
+    monkeypatch.setattr(main_api, "pending_jobs", set())
+    monkeypatch.setattr(main_api, "iter_job_items", iter_job_items)
+    monkeypatch.setitem(main_api.CONFIG, "job_poll_seconds", 0.05)
+    return api
+
+def post(url):
+    return main_api.ScrapedItem(title=url, content="body", content_type="blog", source_url=url, author="")
+
+async def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.01)
+
+def test_job_stopped_by_shutdown_resumes_on_restart_within_its_lease(job_api):
+    async def stuck_crawl(stats):
+        stats.update(discovered=2, done=1, failed=0)
+        yield post("https://example.com/blog/a")
+        await asyncio.Event().wait()
+
+    async def run():
+        job_id = main_api.job_store.create({"url": "https://example.com/blog"})
+        job_api.crawl = stuck_crawl
+        await main_api.start_job_workers()
+        await wait_for(lambda: main_api.job_store.count_items(job_id) == 1)
+        await main_api.stop_job_workers()
+        return job_id
+
+    job_id = asyncio.run(run())
+
+    restarted = JobStore(job_api.path)
+    assert restarted.get(job_id)["status"] == QUEUED
+    assert restarted.claimable() == [job_id]
+    assert restarted.done_urls(job_id) == {"https://example.com/blog/a"}
+
+def test_workers_poll_for_jobs_queued_after_startup(job_api):
+    async def crawl(stats):
+        stats.update(discovered=1, done=1, failed=0)
+        yield post("https://example.com/blog/a")
+
+    async def run():
+        job_api.crawl = crawl
+        await main_api.start_job_workers()
+        # Queued by another process: only polling can find it
+        job_id = JobStore(job_api.path).create({"url": "https://example.com/blog"})
+        await wait_for(lambda: main_api.job_store.get(job_id)["status"] == SUCCEEDED)
+        await main_api.stop_job_workers()
+
+    asyncio.run(run())
@@ -0,0 +1,16 @@
+from links import extract_anchors, find_post_urls
+
+def test_extract_anchors_keeps_href_and_text():
+    html = '<ul><li><a href="/blog/one">One <b>post</b></a></li><li><a name="x">no href</a></li></ul>'
+    assert extract_anchors(html) == [("/blog/one", "One post")]
+
+def test_find_post_urls_single_pass():
+    html = (
+        '<a href="/blog/">Blog</a><a href="/blog/one?utm_source=rss">One</a><a href="/blog/one">Again</a>'
+        '<a href="/2024/01/02/dated">Dated</a><a href="https://other.com/blog/x">Other</a><a href="/about">About</a>'
+    )
+    assert find_post_urls("https://a.com/blog", html) == ["https://a.com/blog/one", "https://a.com/2024/01/02/dated"]
+
+def test_find_post_urls_domain_rules():
+    html = '<a href="https://cdn.substack.com/p/elsewhere">x</a><a href="/about">About</a>'
+    assert find_post_urls("https://me.substack.com/", html) == ["https://cdn.substack.com/p/elsewhere"]
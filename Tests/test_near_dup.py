@@ -0,0 +1,17 @@
+from near_dup import SimHashIndex, simhash, max_distance_for
+
+ARTICLE = " ".join(
+    f"Sentence {i} explains how to approach dynamic programming problems in interviews." for i in range(60)
+)
+
+def test_changed_footer_is_a_near_duplicate():
+    index = SimHashIndex(max_distance_for(0.95))
+    assert index.add_if_new(simhash(ARTICLE), "https://interviewing.io/blog/dp") is None
+    repost = ARTICLE + " Subscribe to our newsletter for more."
+    assert index.add_if_new(simhash(repost), "https://interviewing.io/topics/dp") == "https://interviewing.io/blog/dp"
+
+def test_unrelated_article_is_kept():
+    index = SimHashIndex(max_distance_for(0.95))
+    index.add(simhash(ARTICLE), "a")
+    other = " ".join(f"Graph traversal note {i}: breadth-first search uses a queue." for i in range(60))
+    assert index.find(simhash(other)) is None
@@ -0,0 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pdf_stream import chunk_pages, count_pages, iter_pages
+
+def test_iter_pages_in_order_with_and_without_pool(tmp_path, make_pdf):
+    pdf = tmp_path / "book.pdf"
+    make_pdf(pdf, [f"Page number {i}" for i in range(1, 6)])
+    assert count_pages(str(pdf)) == 5
+    sequential = [(n, text.strip()) for n, text in iter_pages(str(pdf))]
+    assert sequential == [(i, f"Page number {i}") for i in range(1, 6)]
+    with ThreadPoolExecutor(2) as pool:
+        parallel = [(n, text.strip()) for n, text in iter_pages(str(pdf), executor=pool, pages_per_task=2)]
+    assert parallel == sequential
+    assert len(list(iter_pages(str(pdf), max_pages=2))) == 2
+
+def test_chunk_pages_tracks_page_ranges_and_size():
+    pages = [(1, "Intro paragraph.\n\n" + "word " * 100), (2, "Second page."), (3, "Third page.")]
+    chunks = list(chunk_pages(pages, max_chars=120, overlap=20))
+    assert all(len(chunk.text) <= 120 for chunk in chunks)
+    assert chunks[0].first_page == 1
+    assert chunks[-1].last_page == 3
+    assert all(chunk.first_page <= chunk.last_page for chunk in chunks)
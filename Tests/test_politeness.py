@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+from politeness import HostScheduler
+
+def test_same_host_is_spaced_out():
+    scheduler = HostScheduler(lambda url: (0.05, 0.05))
+    assert scheduler.wait("https://a.com/1") == 0
+    assert scheduler.wait("https://a.com/2") > 0.03
+
+def test_hosts_do_not_wait_on_each_other():
+    scheduler = HostScheduler(lambda url: (1, 1))
+
+    async def crawl():
+        urls = [f"https://host{i}.com/post" for i in range(5)]
+        return await asyncio.gather(*(scheduler.wait_async(url) for url in urls))
+
+    start = time.monotonic()
+    assert asyncio.run(crawl()) == [0] * 5
+    assert time.monotonic() - start < 0.5
+
+def test_queued_fetches_stay_spaced_once_slots_free_up():
+    from concurrency import AdaptiveConcurrency
+    from http_client import get_with_retry
+
+    scheduler = HostScheduler(lambda url: (0.05, 0.05))
+    limiter = AdaptiveConcurrency(initial=2, floor=1, ceiling=2)
+    sent = []
+
+    class Response:
+        status = 200
+        headers = {}
+
+        def release(self):
+            pass
+
+    class Session:
+        async def get(self, url, **kwargs):
+            sent.append(time.monotonic())
+            await asyncio.sleep(0.2 if len(sent) <= 2 else 0)
+            return Response()
+
+    async def fetch(i):
+        async with get_with_retry(Session(), f"https://a.com/{i}", limiter=limiter, scheduler=scheduler):
+            pass
+
+    async def crawl():
+        await asyncio.gather(*(fetch(i) for i in range(4)))
+
+    asyncio.run(crawl())
+    gaps = [later - earlier for earlier, later in zip(sent, sent[1:])]
+    assert min(gaps) > 0.04
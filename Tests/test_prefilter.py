@@ -0,0 +1,22 @@
+import metrics
+from prefilter import Prefilter
+
+BODY = "<p>" + " ".join(f"word{i}" for i in range(100)) + "</p>"
+
+def page(title="Post", body=BODY):
+    return f"<html><head><title>{title}</title></head><body>{body}</body></html>"
+
+def test_verdicts():
+    prefilter = Prefilter()
+    assert prefilter.check(page()).action == "extract"
+    assert prefilter.check(page("Page not found | Blog")) == ("reject", "soft_404")
+    assert prefilter.check(page("404 errors explained")).action == "extract"
+    assert prefilter.check(page(body='<div id="app"></div><noscript>Enable JavaScript</noscript>')) \
+        == ("reject", "noscript_only")
+    assert prefilter.check(page(body="<p>Please log in to continue.</p>" + BODY)).reason == "login_wall"
+    assert prefilter.check(page(body=BODY + "<script>" + "x" * 500000 + "</script>")) == ("light", "low_text_density")
+
+def test_verdicts_are_counted():
+    before = metrics.get("prefilter", "too_little_text")
+    Prefilter().check(page(body="<p>Hi</p>"))
+    assert metrics.get("prefilter", "too_little_text") == before + 1
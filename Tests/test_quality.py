@@ -0,0 +1,19 @@
+from quality import QualityScorer
+
+ARTICLE = ("Dynamic programming breaks a problem into overlapping subproblems and caches each answer. "
+           "Memoization stores results top-down, while tabulation fills a table bottom-up.")
+
+def test_clean_article_passes():
+    report = QualityScorer().score(ARTICLE, f"<article><p>{ARTICLE}</p></article>")
+    assert report.reasons == []
+    assert report.score > 0.9
+
+def test_reasons_for_noisy_repetitive_and_link_heavy_pages():
+    scorer = QualityScorer()
+    assert "noise_signals" in scorer.score("Accept our cookie policy, sign up and subscribe. " + ARTICLE).reasons
+    assert scorer.score("spam " * 50).reasons == ["low_lexical_diversity"]
+    links = "".join(f'<a href="/p/{i}">{word}</a> ' for i, word in enumerate(ARTICLE.split()))
+    assert "link_heavy" in scorer.score(ARTICLE, f"<div>{links}</div>").reasons
+
+def test_thresholds_are_configurable():
+    assert QualityScorer(noise_signals=(), min_lexical_diversity=0.01).score("spam " * 50).reasons == []
@@ -0,0 +1,21 @@
+from resume_utils import (
+    lastmod_unchanged,
+    load_checkpoint,
+    load_url_records,
+    save_checkpoint,
+    save_url_records,
+)
+
+def test_records_and_processed_urls_share_the_checkpoint(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    save_url_records({"https://a.com/p/1": {"lastmod": "2024-01-01", "etag": '"x"'}}, path)
+    save_checkpoint({"https://a.com/p/1"}, path)
+    save_url_records({"https://a.com/p/2": {"lastmod": None}}, path)
+
+    assert load_checkpoint(path) == {"https://a.com/p/1"}
+    assert set(load_url_records(path)) == {"https://a.com/p/1", "https://a.com/p/2"}
+
+def test_lastmod_unchanged_needs_a_date():
+    assert lastmod_unchanged({"lastmod": "2024-01-01"}, "2024-01-01")
+    assert not lastmod_unchanged({"lastmod": None}, None)
+    assert not lastmod_unchanged({}, "2024-01-01")
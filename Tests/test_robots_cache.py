@@ -0,0 +1,106 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_client import build_session
+from robots_cache import RobotsCache
+
+ROBOTS = "User-agent: *\nDisallow: /private/\n"
+
+class FakeResponse:
+    def __init__(self, status, text):
+        self.status_code = self.status = status
+        self.text_body = text
+        self.text = text
+
+class FakeSession:
+    def __init__(self, status=200, text=ROBOTS):
+        self.calls = 0
+        self.status, self.body = status, text
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return FakeResponse(self.status, self.body)
+
+class FakeAsyncSession(FakeSession):
+    def get(self, url, **kwargs):
+        self.calls += 1
+        session = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                await asyncio.sleep(0.01)
+                response = FakeResponse(session.status, session.body)
+                async def text():
+                    return response.text_body
+                response.text = text
+                return response
+
+            async def __aexit__(self, *exc):
+                return False
+        return _Ctx()
+
+def test_one_fetch_per_host():
+    session = FakeSession()
+    cache = RobotsCache(session=session)
+    urls = [f"https://blog.substack.com/p/post-{i}" for i in range(50)]
+    assert all(cache.can_fetch(url) for url in urls)
+    assert not cache.can_fetch("https://blog.substack.com/private/x")
+    assert session.calls == 1
+
+def test_missing_robots_is_cached_as_allow_all():
+    session = FakeSession(status=404, text="")
+    cache = RobotsCache(session=session)
+    assert cache.can_fetch("https://example.com/private/x")
+    assert cache.can_fetch("https://example.com/other")
+    assert session.calls == 1
+
+def test_concurrent_async_lookups_are_coalesced():
+    session = FakeAsyncSession()
+    cache = RobotsCache()
+
+    async def crawl():
+        urls = [f"https://blog.substack.com/p/post-{i}" for i in range(50)]
+        return await asyncio.gather(*(cache.can_fetch_async(session, url) for url in urls))
+
+    assert all(asyncio.run(crawl()))
+    assert session.calls == 1
+
+def test_server_error_disallows_until_negative_ttl():
+    session = FakeSession(status=503, text="")
+    cache = RobotsCache(session=session, negative_ttl=0)
+    assert not cache.can_fetch("https://example.com/post")
+    session.status, session.body = 200, ROBOTS
+    assert cache.can_fetch("https://example.com/post")
+    assert session.calls == 2
+
+class Unavailable(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def unavailable_server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Unavailable)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_server_error_disallows_through_the_retrying_session(unavailable_server):
+    # The shared session retries 503s and raises RetryError once it gives up
+    session = build_session({
+        'max_retries': 1,
+        'http_backoff_factor': 0,
+        'http_pool_hosts': 1,
+        'http_pool_per_host': 1,
+        'http_pool_block': False,
+    })
+    cache = RobotsCache(session=session, timeout=5)
+    assert not cache.can_fetch(f"{unavailable_server}/post")
@@ -0,0 +1,38 @@
+import json
+
+from fastapi.testclient import TestClient
+
+import main_api
+
+client = TestClient(main_api.app)
+
+INDEX = "https://blog.example.com/"
+POSTS = [f"https://blog.example.com/blog/post-{i}" for i in range(3)]
+
+def stream_lines():
+    with client.stream("GET", "/scrape", params={"url": INDEX, "stream": "true"}) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        return [json.loads(line) for line in response.iter_lines() if line]
+
+def test_stream_yields_one_item_per_line_then_a_summary(fake_blog):
+    async def fetch(self, session, url, kind="page", headers=None):
+        if url == POSTS[1]:
+            raise ConnectionError("refused")
+        return fake_blog.page(url)
+
+    fake_blog.serve(POSTS, fetch=fetch)
+    lines = stream_lines()
+
+    assert sorted(line["source_url"] for line in lines[:-1]) == [POSTS[0], POSTS[2]]
+    assert lines[-1] == {"summary": {"discovered": 3, "done": 2, "failed": 1, "unchanged": 0}}
+
+def test_failed_crawl_ends_with_an_error_line_before_the_summary(fake_blog):
+    async def fetch(self, session, url, kind="page", headers=None):
+        raise ConnectionError("index unreachable")
+
+    fake_blog.serve(POSTS, fetch=fetch)
+    lines = stream_lines()
+
+    assert lines[0]["error"].startswith("Scraping failed: index unreachable")
+    assert "summary" in lines[-1] and len(lines) == 2
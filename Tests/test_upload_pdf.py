@@ -0,0 +1,47 @@
+import json
+
+from fastapi.testclient import TestClient
+
+import main_api
+
+client = TestClient(main_api.app)
+
+def test_oversized_upload_rejected_from_content_length(monkeypatch):
+    monkeypatch.setattr(main_api, "max_upload_bytes", 1024)
+    response = client.post("/upload-pdf", files={"file": ("big.pdf", b"x" * (main_api.MULTIPART_SLACK + 4096))})
+    assert response.status_code == 413
+
+def test_upload_streams_chunks_with_page_ranges(tmp_path, make_pdf):
+    pdf = tmp_path / "book.pdf"
+    make_pdf(pdf, [f"Page {i} " + "lorem ipsum " * 20 for i in range(1, 4)])
+    response = client.post("/upload-pdf?stream=true", files={"file": ("book.pdf", pdf.read_bytes())})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert response.status_code == 200
+    assert lines and lines[0]["page_start"] == 1 and lines[-1]["page_end"] == 3
+
+def test_chunked_upload_is_cut_off_while_it_arrives(monkeypatch, tmp_path):
+    monkeypatch.setattr(main_api, "max_upload_bytes", 4096)
+    monkeypatch.setitem(main_api.CONFIG, "upload_dir", str(tmp_path))
+
+    def body():
+        yield b'--X\r\nContent-Disposition: form-data; name="file"; filename="big.pdf"\r\n\r\n'
+        for _ in range(64):
+            yield b"x" * 1024
+        yield b"\r\n--X--\r\n"
+
+    response = client.post("/upload-pdf", content=body(),
+                           headers={"Content-Type": "multipart/form-data; boundary=X"})
+    assert response.status_code == 413
+    assert list(tmp_path.iterdir()) == []
+
+def test_uploads_leave_no_temp_files(monkeypatch, tmp_path, make_pdf):
+    monkeypatch.setitem(main_api.CONFIG, "upload_dir", str(tmp_path / "spool"))
+    (tmp_path / "spool").mkdir()
+    pdf = tmp_path / "book.pdf"
+    make_pdf(pdf, ["Page 1 " + "lorem ipsum " * 20])
+
+    assert client.post("/upload-pdf", files={"file": ("book.pdf", pdf.read_bytes())}).status_code == 200
+    assert client.post("/upload-pdf", files={"file": ("notes.txt", b"text")}).status_code == 400
+    with client.stream("POST", "/upload-pdf?stream=true", files={"file": ("book.pdf", pdf.read_bytes())}):
+        pass
+    assert list((tmp_path / "spool").iterdir()) == []
@@ -1,95 +1,122 @@
 
 import asyncio
-import aiohttp
 import logging
-import random
-import time
-from urllib.parse import urlparse
+from contextlib import nullcontext
 from extractor import (
-    can_fetch,
-    detect_content_type_advanced,
-    _validate_url,
-    get_site_config,
-    seen_hashes,
+    robots_cache,
+    scheduler,
+    http_cache,
     CONFIG,
-    _get_content_hash
+    HEADERS,
+    async_retry,
+    async_session,
+    private_async_session,
+    host_breaker,
+    host_concurrency,
+    prefilter,
+    _drop_duplicates,
+    _extract_paragraphs
 )
-from goose3 import Goose
-import html2text
-from bs4 import BeautifulSoup
+from http_cache import cached_get_async
+from http_client import has_async_session
+from canonical import SeenURLs, canonical_link, unique_urls
+from extraction_pool import extract_article, get_executor
 
 logger = logging.getLogger("AsyncExtractor")
 
-async def fetch_and_extract(session, url, semaphore):
-    async with semaphore:
-        if not can_fetch(url):
-            logger.warning(f"❌ Disallowed by robots.txt: {url}")
-            return []
+async def fetch_and_extract(session, url, semaphore=None, executor=None, seen=None):
+    if seen is not None and not seen.claim(url):
+        return []
 
+    if host_breaker.is_open(url):
+        logger.warning(f"⛔ Circuit open for its host, skipped: {url}")
+        return []
+
+    if not await robots_cache.can_fetch_async(session, url):
+        logger.warning(f"❌ Disallowed by robots.txt: {url}")
+        return []
+
+    # `semaphore`, if given, caps fetches across hosts; the host's adaptive
+    # limit decides how many of its fetches run at once. The politeness slot
+    # is taken last, once the fetch holds its concurrency slot, so fetches
+    # that queued for a slot still go out spaced by the host's delay.
+    async with semaphore or nullcontext():
         try:
-            async with session.get(url, timeout=CONFIG['request_timeout']) as response:
-                html = await response.text()
+            page = await cached_get_async(session, url, http_cache, "async_article", headers=HEADERS,
+                                          retry=async_retry, breaker=host_breaker, limiter=host_concurrency,
+                                          scheduler=scheduler, timeout=CONFIG['request_timeout'])
         except Exception as e:
             logger.error(f"❌ Async fetch failed for {url}: {e}")
             return []
 
-        g = Goose()
-        article = g.extract(raw_html=html)
-
-        if not article.cleaned_text or len(article.cleaned_text.strip()) < CONFIG['min_content_length']:
-            logger.warning(f"⚠️ Skipped short content: {url}")
-            return []
-
-        h = html2text.HTML2Text()
-        h.ignore_links = False
-        markdown_content = h.handle(article.cleaned_article_html)
-
-        if len(markdown_content) < CONFIG['min_content_length']:
-            return []
-
-        content_hash = _get_content_hash(markdown_content)
-        if content_hash in seen_hashes:
-            logger.info(f"🔁 Duplicate skipped: {url}")
-            return []
-        seen_hashes.add(content_hash)
-
-        soup = BeautifulSoup(html, "html.parser")
-        meta_author = soup.find("meta", attrs={"name": "author"})
-        author = meta_author.get("content", "") if meta_author else article.meta_data.get("author", CONFIG['pdf_author'])
-
-        return [{
-            "title": article.title or "Untitled",
-            "content": markdown_content.strip(),
-            "content_type": detect_content_type_advanced(url, html),
-            "source_url": url,
-            "author": author,
-            "user_id": ""
-        }]
+    if seen is not None and not seen.claim_aliases(url, page.url, canonical_link(page.url, page.text)):
+        logger.info(f"🔁 Same canonical page as an earlier URL, skipping: {url}")
+        return []
 
-async def extract_from_urls_async(urls, max_concurrent=5):
-    """Extract content from multiple URLs concurrently"""
+    if page.items is not None:
+        # 304 Not Modified: reuse the extraction stored with the cached body
+        logger.info(f"♻️ Not modified, reusing cached extraction: {url}")
+        items = page.items
+    else:
+        # CPU-bound extraction runs in the process pool so the event loop keeps
+        # fetching while workers parse.
+        loop = asyncio.get_running_loop()
+        verdict = prefilter.check(page.text)
+        if verdict.action == "reject":
+            logger.info(f"🚫 Prefilter rejected ({verdict.reason}): {url}")
+            items = []
+        elif verdict.action == "light":
+            items = await loop.run_in_executor(executor or get_executor(), _extract_paragraphs, url, page.text)
+        else:
+            item, detail = await loop.run_in_executor(executor or get_executor(), extract_article, url, page.text)
+            if item is None:
+                logger.warning(f"⚠️ Skipped ({detail}): {url}")
+            items = [item] if item else []
+        if http_cache:
+            http_cache.store_items(url, "async_article", items)
+
+    return _drop_duplicates(url, items)
+
+async def extract_from_urls_async(urls, max_concurrent=None, executor=None, session=None):
+    """Extract content from multiple URLs concurrently.
+
+    Each host's fetches are limited by its adaptive concurrency limit
+    (extractor.host_concurrency), which grows while the host answers
+    quickly and is cut on 429s, 5xx, timeouts and latency spikes.
+    max_concurrent optionally caps fetches across all hosts. Fetches go
+    through `session`, by default the loop's long-lived one
+    (extractor.async_session) if it is open, so connections and DNS lookups
+    carry over between calls. Without one, the call opens a private session
+    and closes only that; the shared session is never closed here, since
+    other calls on the loop may be using it. Transient failures are retried
+    with backoff.
+    Extraction runs on `executor` (the shared extraction process pool by
+    default).
+    """
+    urls = unique_urls(urls)
     if not urls:
         return []
 
-    config = get_site_config(urls[0])
-    semaphore = asyncio.Semaphore(max_concurrent)
+    owns_session = session is None and not has_async_session()
+    if session is None:
+        session = private_async_session() if owns_session else async_session()
+    seen = SeenURLs()
+    semaphore = asyncio.Semaphore(max_concurrent) if max_concurrent else None
     all_items = []
 
-    async with aiohttp.ClientSession() as session:
-        tasks = [fetch_and_extract(session, url, semaphore) for url in urls]
+    tasks = [fetch_and_extract(session, url, semaphore, executor, seen) for url in urls]
 
+    try:
         # Process results as they complete
         for coro in asyncio.as_completed(tasks):
             try:
                 result = await coro
                 all_items.extend(result)
-
-                # Use async sleep instead of blocking time.sleep
-                delay = random.uniform(*config['delay'])
-                await asyncio.sleep(delay)
-
             except Exception as e:
                 logger.error(f"Task failed: {e}")
                 continue
+    finally:
+        if owns_session:
+            await session.close()
 
     return all_items
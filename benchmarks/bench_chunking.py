@@ -0,0 +1,77 @@
+"""Chunking time as input grows: old utils.chunk_text_by_size vs. chunking.iter_chunks.
+
+    python benchmarks/bench_chunking.py [--sizes 1 2 4 8] [--paragraph-chars 40000]
+
+Each run chunks N MB of text at 1500 chars with 200 overlap. ms/MB should
+stay flat as N grows (linear time). "max chunk" shows whether the 1500-char
+budget held: the old code emits a paragraph larger than the budget whole.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chunking import iter_chunks
+
+SENTENCE = "Practice explaining trade-offs out loud before the real interview. "
+
+
+def old_chunk_text_by_size(text, max_chars=1500, overlap=200):
+    paragraphs = text.split("\n\n")
+    chunks = []
+    current_chunk = ""
+
+    for para in paragraphs:
+        para = para.strip()
+        if not para:
+            continue
+
+        if len(current_chunk) + len(para) + 2 <= max_chars:
+            current_chunk += para + "\n\n"
+        else:
+            chunks.append(current_chunk.strip())
+            if overlap:
+                overlap_text = current_chunk[-overlap:]
+                current_chunk = overlap_text + para + "\n\n"
+            else:
+                current_chunk = para + "\n\n"
+
+    if current_chunk.strip():
+        chunks.append(current_chunk.strip())
+
+    return chunks
+
+
+def synthetic_text(megabytes, paragraph_chars):
+    paragraph = (SENTENCE * (paragraph_chars // len(SENTENCE) + 1))[:paragraph_chars]
+    count = megabytes * 1024 * 1024 // (paragraph_chars + 2) + 1
+    return "\n\n".join([paragraph] * count)
+
+
+def timed(fn, text):
+    start = time.process_time()
+    chunks = fn(text)
+    return time.process_time() - start, len(chunks), max(map(len, chunks))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8], help="input sizes in MB")
+    parser.add_argument("--paragraph-chars", type=int, default=40000,
+                        help="paragraph length; above 1500 the old code overshoots the budget")
+    args = parser.parse_args()
+
+    print(f"{'MB':>4} {'old ms/MB':>10} {'new ms/MB':>10} {'old chunks':>11} {'new chunks':>11} "
+          f"{'old max chunk':>14} {'new max chunk':>14}")
+    for megabytes in args.sizes:
+        text = synthetic_text(megabytes, args.paragraph_chars)
+        t_old, n_old, max_old = timed(old_chunk_text_by_size, text)
+        t_new, n_new, max_new = timed(lambda t: list(iter_chunks(t, max_size=1500, overlap=200)), text)
+        print(f"{megabytes:>4} {t_old * 1000 / megabytes:>10.1f} {t_new * 1000 / megabytes:>10.1f} "
+              f"{n_old:>11} {n_new:>11} {max_old:>14} {max_new:>14}")
+
+
+if __name__ == "__main__":
+    main()
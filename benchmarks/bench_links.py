@@ -0,0 +1,102 @@
+"""CPU time per index page: BeautifulSoup + per-pattern regex vs. links.find_post_urls.
+
+    python benchmarks/bench_links.py [--pages 20] [--links 5000] [index.html ...]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from urllib.parse import urljoin, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from links import find_post_urls
+
+BLOG_PATTERNS = [
+    r'/blog/[^/]+/?$',
+    r'/post/[^/]+/?$',
+    r'/article/[^/]+/?$',
+    r'/\d{4}/\d{2}/\d{2}/',
+    r'/p/[^/]+/?$',
+    r'/guides/[^/]+/?$',
+    r'/topics/[^/]+/?$',
+    r'/learn/[^/]+/?$',
+]
+
+
+def synthetic_index(n_links=5000):
+    shapes = ["/blog/post-{i}", "/2024/05/{day:02d}/story-{i}", "/about/team-{i}",
+              "https://cdn.example.net/img/{i}.png", "/guides/guide-{i}", "/tag/tag-{i}"]
+    items = "".join(
+        f'<li class="card"><div><a href="{shapes[i % len(shapes)].format(i=i, day=i % 28 + 1)}">'
+        f'<span>Entry {i}</span></a><p>Teaser text for entry {i} with a few words.</p></div></li>'
+        for i in range(n_links)
+    )
+    return f"<html><head><title>Index</title></head><body><nav></nav><ul>{items}</ul></body></html>"
+
+
+def before(base_url, html):
+    """Previous BlogScraper.find_blog_post_urls on interviewing.io: full tree, 8 searches, second walk"""
+    soup = BeautifulSoup(html, "html.parser")
+    urls = set()
+    base_domain = urlparse(base_url).netloc
+    for link in soup.find_all('a', href=True):
+        full_url = urljoin(base_url, link.get('href'))
+        parsed_url = urlparse(full_url)
+        if parsed_url.netloc != base_domain:
+            continue
+        for pattern in BLOG_PATTERNS:
+            if re.search(pattern, parsed_url.path):
+                urls.add(full_url)
+                break
+    for link in soup.find_all('a', href=True):
+        href = link.get('href')
+        if any(pattern in href for pattern in ['/blog/', '/guides/', '/topics/', '/learn/']):
+            full_url = urljoin(base_url, href)
+            if full_url != base_url:
+                urls.add(full_url)
+    return urls
+
+
+def after(base_url, html):
+    return find_post_urls(base_url, html)
+
+
+def run(fn, pages):
+    start = time.process_time()
+    for url, html in pages:
+        fn(url, html)
+    return (time.process_time() - start) / len(pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="HTML index pages to use instead of synthetic ones")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--links", type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.files:
+        pages = []
+        for path in args.files:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append(("https://interviewing.io/blog", f.read()))
+    else:
+        pages = [("https://interviewing.io/blog", synthetic_index(args.links))] * args.pages
+
+    run(after, pages[:1])  # warm up
+
+    t_before = run(before, pages)
+    t_after = run(after, pages)
+    print(f"pages:   {len(pages)} ({len(pages[0][1]) // 1024} KiB each)")
+    print(f"links:   {len(before(*pages[0]))} before, {len(after(*pages[0]))} after")
+    print(f"before:  {t_before * 1000:.2f} ms CPU/page")
+    print(f"after:   {t_after * 1000:.2f} ms CPU/page")
+    print(f"speedup: {t_before / t_after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
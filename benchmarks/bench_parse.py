@@ -0,0 +1,91 @@
+"""CPU time per page: three-parse pipeline vs. the shared ParsedDocument.
+
+    python benchmarks/bench_parse.py [--pages 50] [page.html ...]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from goose3 import Goose
+
+from document import ParsedDocument
+from extractor import detect_content_type, detect_content_type_advanced, get_author
+
+
+def synthetic_page(n_paragraphs=200, n_links=300):
+    nav = "".join(f'<li><a href="/blog/post-{i}">Post {i}</a></li>' for i in range(n_links))
+    body = "".join(
+        f"<p>Paragraph {i} about system design interviews, graphs and dynamic programming. "
+        "Practice explaining trade-offs out loud before the real thing.</p>"
+        for i in range(n_paragraphs)
+    )
+    return (
+        "<html><head><title>Benchmark page</title>"
+        '<meta name="author" content="Aline"><meta property="og:type" content="article">'
+        '<meta name="twitter:card" content="summary"></head>'
+        f'<body><nav><ul>{nav}</ul></nav><article itemtype="https://schema.org/Article">'
+        f"<h1>Benchmark page</h1>{body}</article></body></html>"
+    )
+
+
+def before(goose, url, html):
+    """Goose parse + BeautifulSoup for author + BeautifulSoup for content type"""
+    article = goose.extract(raw_html=html)
+    soup = BeautifulSoup(html, "html.parser")
+    meta_author = soup.find("meta", attrs={"name": "author"})
+    author = meta_author.get("content", "") if meta_author else ""
+    soup = BeautifulSoup(html, "html.parser")
+    schema = soup.find(attrs={"itemtype": True})
+    if schema and "Article" in schema.get("itemtype", ""):
+        content_type = "article"
+    else:
+        og_type = soup.find("meta", property="og:type")
+        content_type = og_type["content"] if og_type else detect_content_type(url)
+    return article.title, author, content_type
+
+
+def after(goose, url, html):
+    """Goose parse only; metadata is read from Goose's own tree"""
+    article = goose.extract(raw_html=html)
+    doc = ParsedDocument.from_article(article)
+    return article.title, get_author(doc, article), detect_content_type_advanced(url, doc)
+
+
+def run(fn, pages, goose):
+    start = time.process_time()
+    for url, html in pages:
+        fn(goose, url, html)
+    return (time.process_time() - start) / len(pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="HTML files to use instead of synthetic pages")
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.files:
+        pages = []
+        for path in args.files:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append((f"https://example.com/{os.path.basename(path)}", f.read()))
+    else:
+        pages = [(f"https://example.com/blog/post-{i}", synthetic_page()) for i in range(args.pages)]
+
+    goose = Goose()
+    run(after, pages[:2], goose)  # warm up
+
+    t_before = run(before, pages, goose)
+    t_after = run(after, pages, goose)
+    print(f"pages:   {len(pages)}")
+    print(f"before:  {t_before * 1000:.2f} ms CPU/page")
+    print(f"after:   {t_after * 1000:.2f} ms CPU/page")
+    print(f"speedup: {t_before / t_after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
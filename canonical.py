@@ -0,0 +1,106 @@
+import posixpath
+import re
+import threading
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_hsenc", "_hsmi", "mkt_tok", "ref_src",
+}
+TRACKING_PREFIXES = ("utm_",)
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+CANONICAL_LINK = re.compile(r'<link\b[^>]*\brel=["\']?canonical["\']?[^>]*>', re.IGNORECASE)
+HREF = re.compile(r'\bhref=["\']([^"\']+)["\']', re.IGNORECASE)
+
+
+def _is_tracking(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url):
+    """Normalized, still fetchable form of url.
+
+    Lowercases scheme and host, drops default ports, fragments and tracking
+    query parameters, collapses duplicate slashes and dot segments, and
+    sorts the remaining query parameters. A trailing slash is kept: many
+    sites redirect the slashless form, which would cost a request.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    if parsed.port and str(parsed.port) != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parsed.port}"
+
+    path = re.sub(r"/{2,}", "/", parsed.path or "/")
+    path = posixpath.normpath(path) if path not in ("", "/") else "/"
+    if path == ".":
+        path = "/"
+    elif path != "/" and parsed.path.endswith("/"):
+        path += "/"
+
+    query = sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if not _is_tracking(k))
+    return urlunparse((scheme, host, path, "", urlencode(query), ""))
+
+
+def url_key(url):
+    """Identity of a page regardless of scheme, a leading "www." and a trailing slash"""
+    parsed = urlparse(canonicalize_url(url))
+    host = parsed.netloc[4:] if parsed.netloc.startswith("www.") else parsed.netloc
+    path = parsed.path.rstrip("/") or "/"
+    return f"{host}{path}" + (f"?{parsed.query}" if parsed.query else "")
+
+
+def canonical_link(base_url, html):
+    """href of the page's <link rel="canonical">, resolved against base_url, or None"""
+    tag = CANONICAL_LINK.search(html or "")
+    if not tag:
+        return None
+    href = HREF.search(tag.group(0))
+    return urljoin(base_url, href.group(1)) if href else None
+
+
+def unique_urls(urls):
+    """Canonicalize and drop equivalent URLs, keeping the first of each"""
+    seen, result = set(), []
+    for url in urls:
+        key = url_key(url)
+        if key not in seen:
+            seen.add(key)
+            result.append(canonicalize_url(url))
+    return result
+
+
+class SeenURLs:
+    """URL keys claimed during one crawl, including redirect targets and canonicals"""
+
+    def __init__(self):
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    def claim(self, url):
+        """Claim url before fetching it; False if an equivalent URL was already claimed"""
+        key = url_key(url)
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys[key] = key
+            return True
+
+    def claim_aliases(self, url, *aliases):
+        """After fetching url, register where it redirected to and its rel=canonical.
+
+        Returns False when one of those aliases already belongs to another
+        fetched URL, i.e. this page is a duplicate and need not be extracted.
+        """
+        owner = url_key(url)
+        with self._lock:
+            if self._keys.setdefault(owner, owner) != owner:
+                return False
+            keys = {url_key(alias) for alias in aliases if alias} - {owner}
+            if any(self._keys.get(key, owner) != owner for key in keys):
+                return False
+            for key in keys:
+                self._keys[key] = owner
+            return True
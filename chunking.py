@@ -0,0 +1,142 @@
+import re
+from collections import namedtuple
+
+try:
+    import tiktoken
+except ImportError:  # optional: only needed for token budgets
+    tiktoken = None
+
+# first and last are the tags passed to Chunker.feed for the chunk's first
+# and last piece of text (e.g. PDF page numbers)
+Chunk = namedtuple("Chunk", "text first last")
+_Part = namedtuple("_Part", "text sep size tag")
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+PARAGRAPH_SEP = "\n\n"
+WORD_SEP = " "
+
+
+def token_counter(encoding="cl100k_base"):
+    """`length` callable counting tiktoken tokens, for token-budgeted chunks"""
+    if tiktoken is None:
+        raise RuntimeError("Token budgets need tiktoken: pip install tiktoken")
+    encoder = tiktoken.get_encoding(encoding)
+    return lambda text: len(encoder.encode(text, disallowed_special=()))
+
+
+class Chunker:
+    """Packs text into chunks of at most max_size, streaming.
+
+    Size is measured by `length`: len for characters, or a tokenizer such
+    as token_counter(). Chunks break between paragraphs where possible;
+    a paragraph that cannot fit is split at sentences, then words. Each
+    piece of text is measured once and joined once, so the work is linear
+    in the input. Consecutive chunks share up to `overlap` of trailing
+    sentences or words.
+    """
+
+    def __init__(self, max_size=1500, overlap=0, length=len):
+        if not 0 <= overlap < max_size:
+            raise ValueError("overlap must be at least 0 and smaller than max_size")
+        self.max_size = max_size
+        self.overlap = overlap
+        self.length = length
+        self._sep_size = {PARAGRAPH_SEP: length(PARAGRAPH_SEP), WORD_SEP: length(WORD_SEP)}
+        self._parts = []
+        self._size = 0  # size of the parts joined together
+
+    def feed(self, text, tag=None):
+        """Add text; yield every Chunk that fills up"""
+        for paragraph in PARAGRAPH_BREAK.split(text):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            size = self.length(paragraph)
+            if size <= self.max_size:
+                yield from self._add(paragraph, PARAGRAPH_SEP, size, tag)
+                continue
+            sep = PARAGRAPH_SEP
+            for piece, piece_size in self._split(paragraph):
+                yield from self._add(piece, sep, piece_size, tag)
+                sep = WORD_SEP
+
+    def flush(self):
+        """The final, partly filled Chunk (or None); the chunker is then empty"""
+        chunk = self._emit() if self._parts else None
+        self._parts, self._size = [], 0
+        return chunk
+
+    def _split(self, text):
+        """(piece, size) for sentences of text, with oversized ones split into words"""
+        for sentence in SENTENCE_END.split(text):
+            size = self.length(sentence)
+            if size <= self.max_size:
+                yield sentence, size
+                continue
+            for word in sentence.split():
+                size = self.length(word)
+                if size <= self.max_size:
+                    yield word, size
+                    continue
+                for start in range(0, len(word), self.max_size):
+                    piece = word[start:start + self.max_size]
+                    yield piece, self.length(piece)
+
+    def _cost(self, part_size, sep):
+        return part_size + (self._sep_size[sep] if self._parts else 0)
+
+    def _add(self, text, sep, size, tag):
+        if self._parts and self._size + self._cost(size, sep) > self.max_size:
+            yield self._emit()
+            self._parts = self._tail()
+            self._size = self._joined_size(self._parts)
+            while self._parts and self._size + self._cost(size, sep) > self.max_size:
+                dropped = self._parts.pop(0)
+                self._size -= dropped.size + (self._sep_size[self._parts[0].sep] if self._parts else 0)
+        self._size += self._cost(size, sep)
+        self._parts.append(_Part(text, sep, size, tag))
+
+    def _emit(self):
+        pieces = [self._parts[0].text]
+        for part in self._parts[1:]:
+            pieces.append(part.sep)
+            pieces.append(part.text)
+        return Chunk("".join(pieces), self._parts[0].tag, self._parts[-1].tag)
+
+    def _joined_size(self, parts):
+        return sum(part.size for part in parts) + sum(self._sep_size[part.sep] for part in parts[1:])
+
+    def _tail(self):
+        """Trailing parts (whole, or the last sentences/words of one) fitting in overlap"""
+        tail, budget = [], self.overlap
+        for part in reversed(self._parts):
+            joint = self._sep_size[tail[-1].sep] if tail else 0
+            if part.size + joint <= budget:
+                tail.append(part)
+                budget -= part.size + joint
+                continue
+            # Only part of this one fits: keep its last sentences, else its last words
+            pieces = SENTENCE_END.split(part.text)
+            if len(pieces) == 1:
+                pieces = part.text.split()
+            for piece in reversed(pieces):
+                joint = self._sep_size[tail[-1].sep] if tail else 0
+                size = self.length(piece)
+                if size + joint > budget:
+                    break
+                tail.append(_Part(piece, WORD_SEP, size, part.tag))
+                budget -= size + joint
+            break
+        tail.reverse()
+        return tail
+
+
+def iter_chunks(text, max_size=1500, overlap=0, length=len):
+    """Generator of chunk strings for text (see Chunker)"""
+    chunker = Chunker(max_size, overlap, length)
+    for chunk in chunker.feed(text):
+        yield chunk.text
+    last = chunker.flush()
+    if last:
+        yield last.text
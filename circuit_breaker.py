@@ -0,0 +1,126 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+import structlog
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+import metrics
+
+logger = structlog.get_logger("SaveAlineScraper")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RequestsConnectionError):
+    """Raised instead of sending a request while the host's circuit is open"""
+
+
+class _Host:
+    __slots__ = ("state", "failures", "opened_at", "probe_started")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started = None
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker shared by the sync and async fetch paths.
+
+    A host starts closed. failure_threshold consecutive failures (connection
+    errors, timeouts, 5xx/429 after retries) open it, and every request to
+    it then fails fast with CircuitOpenError. After `cooldown` seconds one
+    request is let through as a probe (half-open): success closes the
+    circuit, failure opens it for another cooldown. A probe that never
+    reports back is replaced after a further cooldown.
+
+    Transitions are logged and counted in metrics under "circuit_breaker";
+    hosts that are not closed are listed by states().
+    """
+
+    def __init__(self, failure_threshold=5, cooldown=60, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(failure_threshold=config['circuit_failure_threshold'], cooldown=config['circuit_cooldown'])
+
+    @staticmethod
+    def host_of(url):
+        return urlparse(url).netloc.lower()
+
+    def check(self, url):
+        """Claim permission to request url; raise CircuitOpenError if its host is open"""
+        host = self.host_of(url)
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is None or entry.state == CLOSED:
+                return
+            now = self.clock()
+            if entry.state == OPEN and now - entry.opened_at >= self.cooldown:
+                self._transition(host, entry, HALF_OPEN)
+                entry.probe_started = now
+                return
+            if entry.state == HALF_OPEN and now - entry.probe_started >= self.cooldown:
+                entry.probe_started = now
+                return
+        metrics.inc("circuit_breaker", "rejected")
+        raise CircuitOpenError(f"Circuit open for {host}, not fetching {url}")
+
+    def is_open(self, url):
+        """True while url's host would fail fast (read-only, claims no probe)"""
+        with self._lock:
+            entry = self._hosts.get(self.host_of(url))
+            if entry is None or entry.state == CLOSED:
+                return False
+            now = self.clock()
+            if entry.state == OPEN:
+                return now - entry.opened_at < self.cooldown
+            return now - entry.probe_started < self.cooldown
+
+    def record_success(self, url):
+        host = self.host_of(url)
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is None:
+                return
+            if entry.state != CLOSED:
+                self._transition(host, entry, CLOSED)
+            del self._hosts[host]
+
+    def record_failure(self, url):
+        host = self.host_of(url)
+        with self._lock:
+            entry = self._hosts.setdefault(host, _Host())
+            entry.failures += 1
+            if entry.state == HALF_OPEN or (entry.state == CLOSED and entry.failures >= self.failure_threshold):
+                entry.opened_at = self.clock()
+                self._transition(host, entry, OPEN)
+
+    def state(self, url):
+        with self._lock:
+            entry = self._hosts.get(self.host_of(url))
+            return entry.state if entry else CLOSED
+
+    def states(self):
+        """{host: state} for every host that is open or half-open"""
+        with self._lock:
+            return {host: entry.state for host, entry in self._hosts.items() if entry.state != CLOSED}
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+
+    def _transition(self, host, entry, state):
+        log = logger.warning if state == OPEN else logger.info
+        log(f"Circuit for {host}: {entry.state} -> {state} ({entry.failures} consecutive failures)")
+        entry.state = state
+        metrics.inc("circuit_breaker", state)
@@ -0,0 +1,172 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+import aiohttp
+import structlog
+
+import metrics
+from http_client import is_host_failure
+
+logger = structlog.get_logger("SaveAlineScraper")
+
+
+class _HostLimit:
+    __slots__ = ("limit", "in_flight", "waiters", "latency", "samples", "epoch")
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self.waiters = deque()
+        self.latency = None  # smoothed latency of healthy fetches, seconds
+        self.samples = 0
+        self.epoch = 0  # bumped on every decrease
+
+
+class _Slot:
+    __slots__ = ("overload", "started", "saturated")
+
+    def __init__(self, saturated):
+        self.overload = None
+        self.started = asyncio.get_running_loop().time()
+        self.saturated = saturated  # the host was using its whole limit
+
+    def restart(self):
+        """Time the fetch from now, leaving out waits made while holding the slot"""
+        self.started = asyncio.get_running_loop().time()
+
+    def overloaded(self, reason):
+        """Count this fetch as overload (e.g. a 429 that will be retried) without raising"""
+        self.overload = reason
+
+
+def is_overload(error):
+    """True if a failed fetch says the host is struggling (429/5xx, timeout, refused)"""
+    status = getattr(error, "status", None)
+    if status is not None:
+        return is_host_failure(status)
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError))
+
+
+class AdaptiveConcurrency:
+    """Per-host AIMD limit on in-flight async fetches.
+
+    Each host starts at `initial` concurrent fetches. Every healthy fetch
+    that ran while the host was using its whole limit adds increase/limit,
+    so the limit grows by about `increase` per saturated round of fetches
+    and does not creep up for a host that never needed it. A 429, 5xx,
+    timeout or connection error, or a latency above latency_spike times
+    the host's smoothed latency, multiplies it by `backoff`. Only fetches
+    started since the last cut can cut again, so one burst of errors
+    counts once. The limit stays within floor..ceiling.
+
+    Cuts are logged; "concurrency" metrics count increases and decreases,
+    and limits() shows the current limit of every host.
+    """
+
+    def __init__(self, initial=4, floor=1, ceiling=16, increase=1.0, backoff=0.5, latency_spike=3.0,
+                 smoothing=0.2, min_samples=3):
+        if not 1 <= floor <= initial <= ceiling:
+            raise ValueError("need 1 <= floor <= initial <= ceiling")
+        self.initial = initial
+        self.floor = floor
+        self.ceiling = ceiling
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_spike = latency_spike
+        self.smoothing = smoothing
+        self.min_samples = min_samples
+        self._hosts = {}
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            initial=config['concurrency_initial'],
+            floor=config['concurrency_floor'],
+            ceiling=config['concurrency_ceiling'],
+            backoff=config['concurrency_backoff'],
+            latency_spike=config['latency_spike_factor'],
+        )
+
+    def _host(self, url):
+        host = urlparse(url).netloc.lower()
+        if host not in self._hosts:
+            self._hosts[host] = _HostLimit(float(self.initial))
+        return host, self._hosts[host]
+
+    @asynccontextmanager
+    async def slot(self, url):
+        """Hold one of url's host's fetch slots; the outcome adjusts the limit.
+
+        The block's exception, if any, decides whether the fetch counts as
+        overload; other errors (a 404, an open circuit) leave the limit as
+        it is. The yielded handle's overloaded() flags overload that was
+        handled without raising.
+        """
+        host, state = self._host(url)
+        await self._acquire(state)
+        epoch = state.epoch
+        handle = _Slot(state.in_flight >= int(state.limit))
+        try:
+            yield handle
+        except Exception as e:
+            if is_overload(e):
+                self._decrease(host, state, epoch, type(e).__name__)
+            raise
+        else:
+            if handle.overload:
+                self._decrease(host, state, epoch, handle.overload)
+            else:
+                saturated = handle.saturated or state.in_flight >= int(state.limit)
+                self._record_latency(host, state, epoch, asyncio.get_running_loop().time() - handle.started,
+                                     saturated)
+        finally:
+            state.in_flight -= 1
+            self._wake(state)
+
+    def limits(self):
+        """{host: current in-flight limit}"""
+        return {host: int(state.limit) for host, state in self._hosts.items()}
+
+    async def _acquire(self, state):
+        while state.in_flight >= int(state.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            state.waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake(state)  # pass the wake-up on
+                elif waiter in state.waiters:  # _wake may already have dropped it
+                    state.waiters.remove(waiter)
+                raise
+        state.in_flight += 1
+
+    def _wake(self, state):
+        free = int(state.limit) - state.in_flight
+        while free > 0 and state.waiters:
+            waiter = state.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def _record_latency(self, host, state, epoch, latency, saturated):
+        if state.samples >= self.min_samples and latency > self.latency_spike * state.latency:
+            self._decrease(host, state, epoch, f"latency {latency:.2f}s vs {state.latency:.2f}s")
+        elif saturated and state.limit < self.ceiling:
+            state.limit = min(self.ceiling, state.limit + self.increase / state.limit)
+            metrics.inc("concurrency", "increase")
+            self._wake(state)
+        state.latency = latency if state.latency is None else (
+            (1 - self.smoothing) * state.latency + self.smoothing * latency)
+        state.samples += 1
+
+    def _decrease(self, host, state, epoch, reason):
+        if epoch != state.epoch:
+            return  # started before the last cut, which already accounted for it
+        old = int(state.limit)
+        state.limit = max(self.floor, state.limit * self.backoff)
+        state.epoch += 1
+        metrics.inc("concurrency", "decrease")
+        logger.info(f"Concurrency for {host}: {old} -> {int(state.limit)} ({reason})")
@@ -0,0 +1,105 @@
+import atexit
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+class MemoryDedupStore:
+    """In-process dedup set that forgets the least recently seen keys past max_entries"""
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add_if_new(self, key):
+        """Record key; return True if it had not been seen before"""
+        with self._lock:
+            if key in self._keys:
+                self._keys.move_to_end(key)
+                return False
+            self._keys[key] = None
+            if len(self._keys) > self.max_entries:
+                self._keys.popitem(last=False)
+            return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class SQLiteDedupStore:
+    """Dedup keys persisted in SQLite so they survive restarts and are shared by workers.
+
+    New keys are buffered and written in batches of `batch_size`. The database
+    runs in WAL mode so several API workers can read while one writes. Two
+    processes may both accept the same key if it is still sitting in each
+    other's unflushed batch; that window is bounded by batch_size.
+    """
+
+    def __init__(self, path="dedup.db", batch_size=100):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY) WITHOUT ROWID")
+        atexit.register(self.close)
+
+    def _in_db(self, key):
+        return self._conn.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone() is not None
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._pending or self._in_db(key)
+
+    def add_if_new(self, key):
+        """Record key; return True if it had not been seen before"""
+        with self._lock:
+            if key in self._pending or self._in_db(key):
+                return False
+            self._pending.add(key)
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+            return True
+
+    def _flush(self):
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO seen (key) VALUES (?)", [(k,) for k in self._pending])
+        self._pending.clear()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            if self._conn is None:
+                return
+            self._flush()
+            self._conn.close()
+            self._conn = None
+
+
+def create_dedup_store(config):
+    """Build the dedup backend named by config['dedup_backend'] ('memory' or 'sqlite')"""
+    backend = config.get('dedup_backend', 'memory')
+    if backend == 'sqlite':
+        return SQLiteDedupStore(config.get('dedup_db', 'dedup.db'), config.get('dedup_batch_size', 100))
+    if backend == 'memory':
+        return MemoryDedupStore(config.get('dedup_max_entries', 100000))
+    raise ValueError(f"Unknown dedup backend: {backend}")
@@ -0,0 +1,182 @@
+import re
+from collections import namedtuple
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin, urlparse
+
+from lxml import etree
+
+import structlog
+
+from canonical import canonicalize_url, url_key
+
+logger = structlog.get_logger("SaveAlineScraper")
+
+# lastmod is a UTC ISO-8601 string, or None when the source gives no date
+DiscoveredURL = namedtuple("DiscoveredURL", "url lastmod")
+
+FEED_LINK = re.compile(
+    r'<link\b[^>]*type=["\']application/(?:rss|atom)\+xml["\'][^>]*>', re.IGNORECASE
+)
+HREF = re.compile(r'href=["\']([^"\']+)["\']', re.IGNORECASE)
+
+MAX_SITEMAPS = 20
+MAX_URLS = 50000
+
+
+def _normalize_date(value):
+    """ISO-8601 (sitemaps, Atom) or RFC 822 (RSS) -> UTC ISO string"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def _host(url):
+    netloc = urlparse(url).netloc.lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+def _child_text(elem, name):
+    for child in elem:
+        if etree.QName(child).localname == name:
+            return (child.text or "").strip()
+    return ""
+
+
+def _atom_link(entry):
+    for child in entry:
+        if etree.QName(child).localname == "link" and child.get("rel", "alternate") == "alternate":
+            return child.get("href", "")
+    return ""
+
+
+def parse_feed(stream):
+    """Stream-parse a sitemap, sitemap index, RSS or Atom document.
+
+    Returns (page_urls, child_sitemaps). Elements are cleared as soon as they
+    are read so memory stays flat on large sitemaps.
+    """
+    urls, sitemaps = [], []
+    for _, elem in etree.iterparse(stream, events=("end",), recover=True, resolve_entities=False,
+                                   no_network=True):
+        tag = etree.QName(elem).localname
+        if tag == "url":
+            loc = _child_text(elem, "loc")
+            if loc:
+                urls.append(DiscoveredURL(loc, _normalize_date(_child_text(elem, "lastmod"))))
+        elif tag == "sitemap":
+            loc = _child_text(elem, "loc")
+            if loc:
+                sitemaps.append(loc)
+        elif tag == "item":
+            link = _child_text(elem, "link")
+            if link:
+                urls.append(DiscoveredURL(link, _normalize_date(_child_text(elem, "pubDate"))))
+        elif tag == "entry":
+            link = _atom_link(elem)
+            if link:
+                date = _child_text(elem, "updated") or _child_text(elem, "published")
+                urls.append(DiscoveredURL(link, _normalize_date(date)))
+        else:
+            continue
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+        if len(urls) >= MAX_URLS:
+            break
+    return urls, sitemaps
+
+
+def feed_links(index_url, html):
+    """RSS/Atom feeds advertised by the index page, plus Substack's /feed"""
+    links = []
+    for tag in FEED_LINK.findall(html or ""):
+        href = HREF.search(tag)
+        if href:
+            links.append(urljoin(index_url, href.group(1)))
+    if "substack.com" in urlparse(index_url).netloc:
+        parsed = urlparse(index_url)
+        links.append(f"{parsed.scheme}://{parsed.netloc}/feed")
+    return list(dict.fromkeys(links))
+
+
+def _fetch_xml(session, url, headers, timeout):
+    try:
+        response = session.get(url, headers=headers, timeout=timeout, stream=True)
+        if response.status_code != 200:
+            response.close()
+            return [], []
+        response.raw.decode_content = True
+        with response:
+            return parse_feed(response.raw)
+    except Exception as e:
+        logger.warning(f"Could not read {url}: {e}")
+        return [], []
+
+
+def discover_urls(index_url, session, robots=None, html=None, headers=None, timeout=10):
+    """Find post URLs from feeds and sitemaps before falling back to HTML links.
+
+    Feeds linked from the index page are tried first, since they list exactly
+    the blog's posts. Otherwise robots.txt Sitemap entries and /sitemap.xml
+    (following sitemap indexes) are read and filtered to the index page's
+    host and path. Returns DiscoveredURLs newest first, or [] if no feed or
+    sitemap yields anything.
+    """
+    for feed in feed_links(index_url, html):
+        urls, _ = _fetch_xml(session, feed, headers, timeout)
+        if urls:
+            logger.info(f"Discovered {len(urls)} URLs from feed {feed}")
+            return _newest_first(_canonical(urls))
+
+    parsed = urlparse(index_url)
+    root = f"{parsed.scheme}://{parsed.netloc}"
+    queue = []
+    if robots is not None:
+        try:
+            queue.extend(robots.get(index_url).site_maps() or [])
+        except Exception as e:
+            logger.warning(f"Could not read robots.txt sitemaps for {root}: {e}")
+    queue.append(f"{root}/sitemap.xml")
+
+    host = _host(index_url)
+    prefix = parsed.path.rstrip("/")
+    found, seen = {}, set()
+    while queue and len(seen) < MAX_SITEMAPS:
+        sitemap = queue.pop(0)
+        if sitemap in seen:
+            continue
+        seen.add(sitemap)
+        urls, children = _fetch_xml(session, sitemap, headers, timeout)
+        queue.extend(children)
+        for item in urls:
+            item_path = urlparse(item.url).path
+            if _host(item.url) != host or not item_path.startswith(prefix) or item_path.rstrip("/") == prefix:
+                continue
+            found.setdefault(url_key(item.url), item)
+
+    if found:
+        logger.info(f"Discovered {len(found)} URLs from sitemaps for {index_url}")
+    return _newest_first(_canonical(found.values()))
+
+
+def _canonical(urls):
+    """Canonicalize and drop equivalent URLs, keeping the first of each"""
+    unique = {}
+    for item in urls:
+        unique.setdefault(url_key(item.url), item._replace(url=canonicalize_url(item.url)))
+    return list(unique.values())
+
+
+def _newest_first(urls):
+    return sorted(urls, key=lambda item: item.lastmod or "", reverse=True)
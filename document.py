@@ -0,0 +1,71 @@
+from lxml import etree, html as lxml_html
+
+
+class ParsedDocument:
+    """A page parsed once, with the metadata lookups the extractors need."""
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    @classmethod
+    def from_html(cls, html_content):
+        """Parse raw HTML (str or bytes) with lxml"""
+        if not html_content or not html_content.strip():
+            return cls(None)
+        try:
+            return cls(lxml_html.fromstring(html_content))
+        except etree.ParserError:
+            # Nothing but comments or processing instructions
+            return cls(None)
+        except (ValueError, TypeError):
+            # lxml rejects str input carrying an XML encoding declaration
+            if isinstance(html_content, str):
+                return cls(lxml_html.fromstring(html_content.encode("utf-8")))
+            raise
+
+    @classmethod
+    def from_article(cls, article):
+        """Reuse the tree Goose already built instead of parsing again"""
+        if article.raw_doc is not None:
+            return cls(article.raw_doc)
+        return cls.from_html(article.raw_html)
+
+    def _first(self, xpath):
+        if self.tree is None:
+            return None
+        found = self.tree.xpath(xpath)
+        return found[0] if found else None
+
+    def meta(self, name=None, prop=None):
+        """Return the content of <meta name=...> or <meta property=...>"""
+        if name:
+            node = self._first(f'//meta[@name="{name}"]')
+        else:
+            node = self._first(f'//meta[@property="{prop}"]')
+        if node is None:
+            return ""
+        return (node.get("content") or "").strip()
+
+    @property
+    def author(self):
+        return self.meta(name="author")
+
+    @property
+    def og_type(self):
+        return self.meta(prop="og:type")
+
+    @property
+    def twitter_card(self):
+        return self.meta(name="twitter:card")
+
+    @property
+    def schema_itemtype(self):
+        node = self._first("//*[@itemtype]")
+        return node.get("itemtype", "") if node is not None else ""
+
+    @property
+    def title(self):
+        node = self._first("//title")
+        if node is None or not node.text_content():
+            return ""
+        return node.text_content().strip()
@@ -0,0 +1,53 @@
+import os
+import atexit
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from goose3 import Goose
+
+from extractor import CONFIG, article_item, markdown_converter, parse_article
+
+logger = logging.getLogger("ExtractionPool")
+
+# Per-process extractor instances, created once by _init_worker and reused
+# for every page the worker handles.
+_goose = None
+_converter = None
+_executor = None
+
+def _init_worker():
+    global _goose, _converter
+    _goose = Goose()
+    _converter = markdown_converter()
+
+def _worker_state():
+    if _goose is None:
+        _init_worker()
+    return _goose, _converter
+
+def extract_article(url, html):
+    """Goose + html2text on an already-fetched page.
+
+    Runs inside a pool worker, so it returns plain data and leaves dedup to
+    the caller: (item, None) on success, (None, reason) otherwise.
+    """
+    goose, converter = _worker_state()
+    article, doc = parse_article(html, goose)
+    return article_item(url, article, doc, converter)
+
+def get_executor(max_workers=None):
+    """Shared pool of warm extractor processes (CONFIG['extraction_workers'], default: one per core)"""
+    global _executor
+    if _executor is None:
+        workers = max_workers or CONFIG.get('extraction_workers') or os.cpu_count() or 1
+        logger.info(f"Starting extraction pool with {workers} workers")
+        _executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    return _executor
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+atexit.register(shutdown_executor)
@@ -1,23 +1,39 @@
 import os
-import time
 import hashlib
 import logging
-import random
 from urllib.parse import urlparse, urljoin
 
-import requests
-from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException, Timeout, HTTPError
-from urllib3.util.retry import Retry
 
 from goose3 import Goose
 import html2text
-from bs4 import BeautifulSoup
-from pdfminer.high_level import extract_text
-from utils import chunk_text_by_size
+from document import ParsedDocument
+from robots_cache import RobotsCache
+from politeness import HostScheduler
+from http_cache import HTTPCache, cached_get
+from http_client import AsyncRetry, build_session, get_async_session, open_async_session
+from circuit_breaker import CircuitBreaker
+from concurrency import AdaptiveConcurrency
+from dedup_store import create_dedup_store
+from discovery import DiscoveredURL, discover_urls
+from frontier import CrawlFrontier, classify_link, is_pagination
+from canonical import SeenURLs, canonical_link, canonicalize_url
+from links import extract_anchors
+from near_dup import SimHashIndex, simhash, max_distance_for
+from quality import QualityScorer
+from prefilter import Prefilter
+from pdf_stream import chunk_pages, iter_pages
+from resume_utils import load_url_records, save_url_records, lastmod_unchanged
 import yaml
 from tqdm import tqdm
 
+try:
+    import xxhash
+    _hash128 = xxhash.xxh3_128_hexdigest
+except ImportError:  # pragma: no cover - xxhash is in requirements.txt
+    def _hash128(data):
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 import structlog
@@ -27,32 +43,108 @@ logger = structlog.get_logger("SaveAlineScraper")
 CONFIG = {
     'min_content_length': 100,
     'max_noise_signals': 3,
+    'noise_signals': ['javascript', 'cookie', 'advertising', 'sign up', 'subscribe'],
+    'min_lexical_diversity': 0.3,
+    'max_link_density': 0.5,
+    'min_text_to_markup': 0.05,
+    'prefilter_min_text_chars': 200,
+    'prefilter_min_text_density': 0.01,
     'request_timeout': 10,
     'rate_limit_delay': (1, 3),
     'max_retries': 3,
-    'pdf_author': 'Unknown'
+    'http_backoff_factor': 1,
+    'http_pool_hosts': 32,
+    'http_pool_per_host': 8,
+    'http_pool_block': True,
+    'http_pool_total': 100,
+    'http_max_backoff': 60,
+    'dns_cache_ttl': 300,
+    'circuit_failure_threshold': 5,
+    'circuit_cooldown': 60,
+    'concurrency_initial': 4,
+    'concurrency_floor': 1,
+    'concurrency_ceiling': 16,
+    'concurrency_backoff': 0.5,
+    'latency_spike_factor': 3.0,
+    'pdf_author': 'Unknown',
+    'robots_ttl': 3600,
+    'robots_negative_ttl': 600,
+    'extraction_workers': None,
+    'job_workers': 2,
+    'jobs_db': 'jobs.db',
+    'job_lease_seconds': 300,
+    'job_poll_seconds': 30,
+    'http_cache_dir': None,
+    'http_cache_max_mb': 200,
+    'dedup_backend': 'memory',
+    'dedup_max_entries': 100000,
+    'dedup_db': 'dedup.db',
+    'dedup_batch_size': 100,
+    'near_duplicate_threshold': 0.95,
+    'checkpoint_file': 'checkpoint.json',
+    'crawl_max_depth': 2,
+    'crawl_max_index_pages': 20,
+    'frontier_max_size': 10000,
+    'pdf_pages_per_task': 8,
+    'pdf_workers': 2,
+    'max_upload_mb': 100,
+    'upload_dir': None
 }
 
-# Setup retry strategy for session
-session = requests.Session()
-retries = Retry(
-    total=CONFIG['max_retries'],
-    backoff_factor=1,
-    status_forcelist=[429, 500, 502, 503, 504],
-    allowed_methods=["HEAD", "GET", "OPTIONS"]
-)
-adapter = HTTPAdapter(max_retries=retries)
-session.mount("http://", adapter)
-session.mount("https://", adapter)
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.yaml")
+
+def load_config(config_file=CONFIG_FILE):
+    try:
+        with open(config_file, 'r') as f:
+            config = yaml.safe_load(f)
+        config['rate_limit_delay'] = tuple(config.get('rate_limit_delay', [1, 3]))
+        return config
+    except:
+        return CONFIG  # fallback
+
+# config.yaml overrides the defaults above
+CONFIG.update(load_config())
+
+HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; SaveAlineBot/1.0)"}
+
+# Fails fast for hosts that keep timing out or erroring (sync and async fetches)
+host_breaker = CircuitBreaker.from_config(CONFIG)
+
+# Pooled keep-alive session with the shared retry policy, used by the CLI and the API
+session = build_session(CONFIG, HEADERS, host_breaker)
+
+# aiohttp fetches retry on the same terms, with jittered backoff
+async_retry = AsyncRetry.from_config(CONFIG)
+
+# Per-host AIMD limits on in-flight async fetches
+host_concurrency = AdaptiveConcurrency.from_config(CONFIG)
+
+def async_session():
+    """The running event loop's long-lived aiohttp session (see http_client.get_async_session)"""
+    return get_async_session(CONFIG)
+
+def private_async_session():
+    """A new aiohttp session with the shared connector settings, closed by the caller"""
+    return open_async_session(CONFIG)
 
-seen_hashes = set()
+quality_scorer = QualityScorer.from_config(CONFIG)
+prefilter = Prefilter.from_config(CONFIG)
+
+# Optional on-disk HTTP cache (enabled by setting http_cache_dir)
+http_cache = HTTPCache(CONFIG['http_cache_dir'], CONFIG['http_cache_max_mb'] * 1024 * 1024) if CONFIG['http_cache_dir'] else None
+
+# Content hashes already extracted (see dedup_store.py for the backends)
+dedup_store = create_dedup_store(CONFIG)
+
+# SimHash index for near-duplicates (reposts, syndicated copies, changed footers)
+near_dup_index = SimHashIndex(max_distance_for(CONFIG['near_duplicate_threshold'])) if CONFIG['near_duplicate_threshold'] else None
 
 def _validate_url(url):
     parsed = urlparse(url)
     return parsed.scheme in ['http', 'https'] and parsed.netloc
 
 def _get_content_hash(content):
-    return hashlib.md5(content.encode('utf-8')).hexdigest()
+    return _hash128(content.encode('utf-8'))
 
 def detect_content_type(url):
     url_lower = url.lower()
@@ -73,131 +165,288 @@ def is_index_page(url):
     return any(keyword in url for keyword in ['/blog', 'category', 'topics', 'learn'])
 
 def is_content_too_noisy(text):
-    noise_signals = ["javascript", "cookie", "advertising", "sign up", "subscribe"]
-    noise_count = sum(1 for signal in noise_signals if signal in text.lower())
-    words = text.split()
-    if not words:
-        return True
-    unique_words = set(words)
-    repetition_score = len(unique_words) / len(words)
-    return noise_count >= CONFIG['max_noise_signals'] or repetition_score < 0.3
-
-def extract_from_url(url):
+    return bool(quality_scorer.score(text).reasons)
+
+def fetch_page(url, kind="page", headers=None):
+    """GET url through the shared session, revalidating against the disk cache if enabled"""
+    return cached_get(session, url, http_cache, kind, headers={**HEADERS, **(headers or {})},
+                      timeout=CONFIG['request_timeout'])
+
+def conditional_headers(record):
+    """If-None-Match for a URL record saved by an earlier incremental crawl"""
+    return {"If-None-Match": record["etag"]} if record and record.get("etag") else {}
+
+def update_url_record(record, headers, content):
+    """Save this fetch's ETag and content hash in record; return True if the content changed"""
+    record["etag"] = headers.get("ETag") if headers else None
+    content_hash = _get_content_hash(content)
+    changed = record.get("content_hash") != content_hash
+    record["content_hash"] = content_hash
+    return changed
+
+def extract_from_url(url, record=None, seen=None, lastmod=None):
+    """Extract one article.
+
+    `record` is the URL's entry from an incremental crawl: the fetch is made
+    conditional on its ETag, the entry is updated in place, and a page that
+    comes back 304 or with the same content hash returns []. `lastmod` (the
+    sitemap/feed date) is saved in the entry only on a 304 or once extraction
+    succeeds, so a URL whose fetch or extraction failed is retried on the
+    next crawl.
+
+    `seen` is the crawl's SeenURLs: a page that redirects to, or declares as
+    rel=canonical, a URL another page of the crawl already owns returns [].
+    """
     if not _validate_url(url):
         logger.warning(f"Invalid URL skipped: {url}")
         return []
 
-    headers = {"User-Agent": "Mozilla/5.0 (compatible; SaveAlineBot/1.0)"}
     try:
-        response = session.get(url, headers=headers, timeout=CONFIG['request_timeout'])
-        response.raise_for_status()
+        page = fetch_page(url, kind="article", headers=conditional_headers(record))
     except (RequestException, Timeout, HTTPError) as e:
         logger.error(f"Failed to fetch URL {url}: {e}")
         return []
 
-    g = Goose()
-    article = g.extract(raw_html=response.text)
-
-    if not article.cleaned_text or len(article.cleaned_text.strip()) < CONFIG['min_content_length']:
-        logger.warning(f"Content too short, skipped: {url}")
+    if record is not None and page.status == 304:
+        record["lastmod"] = lastmod
+        logger.info(f"Unchanged since last crawl (304): {url}")
         return []
 
-    h = html2text.HTML2Text()
-    h.ignore_links = False
-    markdown_content = h.handle(article.cleaned_article_html)
-
-    if is_content_too_noisy(markdown_content):
-        logger.warning(f"Noisy content, skipped: {url}")
+    if seen is not None and not seen.claim_aliases(url, page.url, canonical_link(page.url, page.text)):
+        logger.info(f"Same canonical page as an earlier URL, skipping: {url}")
         return []
 
-    content_hash = _get_content_hash(markdown_content)
-    if content_hash in seen_hashes:
-        logger.info(f"Duplicate content detected, skipping: {url}")
-        return []
-    seen_hashes.add(content_hash)
+    if page.items is not None:
+        logger.info(f"Not modified, reusing cached extraction: {url}")
+        items = page.items
+    else:
+        verdict = prefilter.check(page.text)
+        if verdict.action == "reject":
+            logger.info(f"Prefilter rejected ({verdict.reason}): {url}")
+            items = []
+        elif verdict.action == "light":
+            items = _extract_paragraphs(url, page.text)
+        else:
+            items = _extract_article_html(url, page.text)
+        if http_cache:
+            http_cache.store_items(url, "article", items)
+
+    if record is not None:
+        record["lastmod"] = lastmod
+        content = "".join(item["content"] for item in items)
+        if not update_url_record(record, page.headers, content):
+            logger.info(f"Unchanged since last crawl (same content): {url}")
+            return []
+
+    return _drop_duplicates(url, items)
+
+def _extract_article_html(url, html):
+    article, doc = parse_article(html)
+    return _article_items(url, article, doc)
+
+def parse_article(html, goose=None):
+    """Run Goose (a fresh one unless `goose` is given) on a fetched body; the ParsedDocument reuses its tree"""
+    article = (goose or Goose()).extract(raw_html=html)
+    return article, ParsedDocument.from_article(article)
+
+def markdown_converter():
+    converter = html2text.HTML2Text()
+    converter.ignore_links = False
+    return converter
+
+def article_item(url, article, doc, converter):
+    """The item for a Goose article: (item, None), or (None, why it was skipped).
+
+    Both the sync extractors and the extraction pool build items here, so
+    they apply the same checks; `converter` is the caller's html2text
+    converter (see markdown_converter).
+    """
+    if not article.cleaned_text or len(article.cleaned_text.strip()) < CONFIG['min_content_length']:
+        return None, "short content"
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    meta_author = soup.find("meta", attrs={"name": "author"})
-    author = meta_author.get("content", "") if meta_author else article.meta_data.get("author", CONFIG['pdf_author'])
+    quality = quality_scorer.score(article.cleaned_text, article.top_node_raw_html)
+    if quality.reasons:
+        return None, f"low quality: {', '.join(quality.reasons)}; score {quality.score:.2f}"
 
-    return [{
-        "title": article.title or "Untitled",
-        "content": markdown_content.strip(),
-        "content_type": detect_content_type(url),
+    markdown_content = converter.handle(article.top_node_raw_html or "").strip()
+    if len(markdown_content) < CONFIG['min_content_length']:
+        return None, "short markdown"
+
+    item = {
+        "title": article.title or doc.title or "Untitled",
+        "content": markdown_content,
+        "content_type": detect_content_type_advanced(url, doc),
         "source_url": url,
-        "author": author,
+        "author": get_author(doc, article),
         "user_id": ""
-    }]
+    }
+    return item, None
 
-def find_article_links(base_url, max_links=20):
+def _article_items(url, article, doc):
+    item, reason = article_item(url, article, doc, markdown_converter())
+    if item is None:
+        logger.warning(f"Skipped ({reason}): {url}")
+        return []
+    return [item]
+
+def _drop_duplicates(url, items):
+    unique = []
+    for item in items:
+        if not dedup_store.add_if_new(_get_content_hash(item["content"])):
+            logger.info(f"Duplicate content detected, skipping: {url}")
+            continue
+        if near_dup_index is not None:
+            original = near_dup_index.add_if_new(simhash(item["content"]), item["source_url"])
+            if original is not None:
+                logger.info(f"Near-duplicate of {original}, skipping: {url}")
+                continue
+        unique.append(item)
+    return unique
+
+def get_author(doc, article):
+    """Author from <meta name="author">, falling back to what Goose found"""
+    if doc.author:
+        return doc.author
+    return article.authors[0] if article.authors else CONFIG['pdf_author']
+
+def discover_article_links(base_url, max_links=20):
+    """Post URLs with their lastmod dates (DiscoveredURL), best first.
+
+    Feeds and sitemaps are preferred. Without them the index page is crawled
+    through a CrawlFrontier: category pages are expanded up to
+    crawl_max_depth, pagination is followed at the depth of the page it
+    continues, at most crawl_max_index_pages pages are fetched besides the
+    index, and article links come out ordered by pattern confidence,
+    freshness and depth.
+    """
     if not _validate_url(base_url):
         logger.warning(f"Invalid base URL skipped: {base_url}")
         return []
 
-    headers = {"User-Agent": "Mozilla/5.0 (compatible; SaveAlineBot/1.0)"}
     try:
-        res = session.get(base_url, headers=headers, timeout=CONFIG['request_timeout'])
-        res.raise_for_status()
+        res = fetch_page(base_url)
     except (RequestException, Timeout, HTTPError) as e:
         logger.error(f"Failed to crawl index {base_url}: {e}")
         return []
 
-    soup = BeautifulSoup(res.text, "html.parser")
-    article_links = set()
+    frontier = CrawlFrontier(CONFIG['crawl_max_depth'], CONFIG['frontier_max_size'])
+    frontier.visited.add(base_url)
+    frontier.visited.add(res.url)
+
+    discovered = discover_urls(base_url, session, robots_cache, res.text, HEADERS, CONFIG['request_timeout'])
+    for item in discovered:
+        frontier.push(item.url, 1, "article", lastmod=item.lastmod)
+    if not discovered:
+        _push_links(frontier, base_url, res.text, depth=0, hops=0)
+
+    article_links = []
+    index_pages = 0
+    while frontier and len(article_links) < max_links:
+        entry = frontier.pop()
+        if entry.kind == "article":
+            article_links.append(DiscoveredURL(entry.url, entry.lastmod))
+            continue
+        if index_pages >= CONFIG['crawl_max_index_pages'] or host_breaker.is_open(entry.url):
+            continue
+        index_pages += 1
+        try:
+            scheduler.wait(entry.url)
+            page = fetch_page(entry.url)
+        except (RequestException, Timeout, HTTPError) as e:
+            logger.warning(f"Failed to expand {entry.url}: {e}")
+            continue
+        _push_links(frontier, entry.url, page.text, entry.depth, entry.hops)
+
+    return article_links
+
+def _push_links(frontier, page_url, html, depth, hops):
+    """Queue a page's links one hop further; pagination stays at the page's depth, the rest go one deeper"""
+    host = urlparse(canonicalize_url(page_url)).netloc
+    for href, text in extract_anchors(html):
+        href = canonicalize_url(urljoin(page_url, href))
+        kind, confidence = classify_link(href, text)
+        if kind == "index" and urlparse(href).netloc != host:
+            continue  # never expand other sites
+        if kind == "index" and is_pagination(href, text):
+            frontier.push(href, depth, kind, confidence, hops=hops + 1)
+        elif kind:
+            frontier.push(href, depth + 1, kind, confidence, hops=hops + 1)
 
-    for a_tag in soup.find_all("a", href=True):
-        href = urljoin(base_url, a_tag["href"].split('#')[0])  # Strip fragment
-        if ("substack.com/p/" in href or
-            any(keyword in href.lower() for keyword in ["blog", "post", "article", "story", "interview", "guide"])):
-            article_links.add(href)
-        if len(article_links) >= max_links:
-            break
+def find_article_links(base_url, max_links=20):
+    return [item.url for item in discover_article_links(base_url, max_links)]
 
-    return list(article_links)
+def extract_from_blog_index(index_url, max_articles=20, incremental=False):
+    """Crawl an index page and extract its articles.
 
-def extract_from_blog_index(index_url, max_articles=20):
+    With incremental=True only new or changed posts are fetched and returned:
+    a matching sitemap/feed lastmod skips the URL without any request, and
+    ETags and content hashes from the checkpoint catch the rest.
+    """
     logger.info(f"Crawling index: {index_url}")
-    links = find_article_links(index_url, max_articles)
+    links = discover_article_links(index_url, max_articles)
     logger.info(f"Found {len(links)} links")
 
+    records = load_url_records(CONFIG['checkpoint_file']) if incremental else {}
+    seen = SeenURLs()
     all_items = []
     for link in tqdm(links, desc='Extracting articles'):
-        logger.info(f"Processing {link}")
+        if not seen.claim(link.url):
+            continue
+        record = None
+        if incremental:
+            record = records.setdefault(link.url, {})
+            if lastmod_unchanged(record, link.lastmod):
+                logger.info(f"Unchanged lastmod, skipped: {link.url}")
+                continue
+        if host_breaker.is_open(link.url):
+            logger.warning(f"Circuit open for its host, skipped: {link.url}")
+            continue
+        logger.info(f"Processing {link.url}")
         try:
-            time.sleep(random.uniform(*CONFIG['rate_limit_delay']))
-            items = extract_from_url(link)
+            scheduler.wait(link.url)
+            items = extract_from_url(link.url, record, seen, link.lastmod)
             all_items.extend(items)
         except Exception as e:
             logger.error(f"Unhandled error while extracting: {e}", exc_info=True)
+
+    if incremental:
+        save_url_records(records, CONFIG['checkpoint_file'])
     return all_items
 
-def extract_from_pdf(pdf_path, max_pages=50):
+def extract_from_pdf(pdf_path, max_pages=50, executor=None):
+    """Chunk a PDF page by page; pages are laid out on `executor` when given.
+
+    Each item records the pages its chunk came from in page_start/page_end.
+    """
     logger.info(f"Extracting PDF: {pdf_path}")
     if not os.path.exists(pdf_path):
         logger.error(f"File not found: {pdf_path}")
         return []
 
+    items = []
     try:
-        text = extract_text(pdf_path, maxpages=max_pages)
+        pages = iter_pages(pdf_path, max_pages, executor, CONFIG['pdf_pages_per_task'])
+        for i, chunk in enumerate(chunk_pages(pages, max_chars=1500, overlap=200)):
+            items.append({
+                "title": f"Beyond Cracking the Coding Interview - Chunk {i+1}",
+                "content": chunk.text,
+                "content_type": "book",
+                "source_url": "",
+                "author": CONFIG['pdf_author'],
+                "user_id": "",
+                "page_start": chunk.first_page,
+                "page_end": chunk.last_page
+            })
     except Exception as e:
         logger.error(f"Failed to parse PDF: {e}")
         return []
-
-    chunks = chunk_text_by_size(text, max_chars=1500, overlap=200)
-    return [{
-        "title": f"Beyond Cracking the Coding Interview - Chunk {i+1}",
-        "content": chunk.strip(),
-        "content_type": "book",
-        "source_url": "",
-        "author": CONFIG['pdf_author'],
-        "user_id": ""
-    } for i, chunk in enumerate(chunks)]
+    return items
 
 SITE_CONFIGS = {
     'substack.com': {'delay': (2, 4), 'max_articles': 50},
     'medium.com': {'delay': (1, 2), 'max_articles': 30},
     'github.com': {'delay': (0.5, 1), 'max_articles': 20},
-    'default': {'delay': (1, 3), 'max_articles': 20}
+    'default': {'delay': CONFIG['rate_limit_delay'], 'max_articles': 20}
 }
 
 def get_site_config(url):
@@ -207,59 +456,54 @@ def get_site_config(url):
             return config
     return SITE_CONFIGS['default']
 
-import urllib.robotparser
+# Per-host rate limiting shared with async_extractor
+scheduler = HostScheduler(lambda url: get_site_config(url)['delay'])
 
-def can_fetch(url, user_agent="*"):
-    try:
-        parsed = urlparse(url)
-        robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
-        rp = urllib.robotparser.RobotFileParser()
-        rp.set_url(robots_url)
-        rp.read()
-        return rp.can_fetch(user_agent, url)
-    except:
-        return True
+robots_cache = RobotsCache(
+    session=session,
+    ttl=CONFIG['robots_ttl'],
+    negative_ttl=CONFIG['robots_negative_ttl'],
+    timeout=CONFIG['request_timeout']
+)
 
-def load_config(config_file="config.yaml"):
-    try:
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
-        config['rate_limit_delay'] = tuple(config.get('rate_limit_delay', [1, 3]))
-        return config
-    except:
-        return CONFIG  # fallback
+def can_fetch(url, user_agent="*"):
+    return robots_cache.can_fetch(url, user_agent)
 
 def detect_content_type_advanced(url, html_content):
-    soup = BeautifulSoup(html_content, 'html.parser')
+    """Content type from page metadata; accepts raw HTML or a ParsedDocument"""
+    doc = html_content if isinstance(html_content, ParsedDocument) else ParsedDocument.from_html(html_content)
 
     # Check for schema.org structured data
-    schema = soup.find(attrs={"itemtype": True})
-    if schema and "Article" in schema.get("itemtype", ""):
+    if "Article" in doc.schema_itemtype:
         return "article"
 
     # Check Open Graph type
-    og_type = soup.find("meta", property="og:type")
-    if og_type and og_type.get("content"):
-        return og_type["content"]
+    if doc.og_type:
+        return doc.og_type
 
     # Check Twitter card type
-    twitter_type = soup.find("meta", attrs={"name": "twitter:card"})
-    if twitter_type and twitter_type.get("content"):
-        return twitter_type["content"]
+    if doc.twitter_card:
+        return doc.twitter_card
 
     return detect_content_type(url)
 
 def extract_from_blog_index_batched(index_url, max_articles=20, batch_size=10):
     logger.info(f"Batched crawl: {index_url}")
     links = find_article_links(index_url, max_articles)
+    seen = SeenURLs()
     all_items = []
 
     for i in range(0, len(links), batch_size):
         batch = links[i:i+batch_size]
         for link in batch:
+            if not seen.claim(link):
+                continue
+            if host_breaker.is_open(link):
+                logger.warning(f"Circuit open for its host, skipped: {link}")
+                continue
             try:
-                time.sleep(random.uniform(*CONFIG['rate_limit_delay']))
-                items = extract_from_url(link)
+                scheduler.wait(link)
+                items = extract_from_url(link, seen=seen)
                 all_items.extend(items)
             except Exception as e:
                 logger.warning(f"Batch extraction failed: {e}")
@@ -269,15 +513,47 @@ def extract_from_blog_index_batched(index_url, max_articles=20, batch_size=10):
     return all_items
 
 def extract_with_fallback(url, max_attempts=3):
-    extractors = [extract_from_url, fallback_bs4_extract]
-    for attempt, extractor in enumerate(extractors):
+    """Extract one article with Goose, falling back to the page's <p> text.
+
+    The page is fetched once: every extractor gets the same body, and the
+    fallback reuses the tree Goose parsed rather than parsing it again.
+    """
+    if not _validate_url(url):
+        logger.warning(f"Invalid URL skipped: {url}")
+        return []
+
+    try:
+        page = fetch_page(url, kind="fallback")
+    except (RequestException, Timeout, HTTPError) as e:
+        logger.error(f"Failed to fetch URL {url}: {e}")
+        return []
+
+    if page.items is not None:
+        logger.info(f"Not modified, reusing cached extraction: {url}")
+        return _drop_duplicates(url, page.items)
+
+    items = extract_from_body(url, page.text)
+    if http_cache:
+        http_cache.store_items(url, "fallback", items)
+    return _drop_duplicates(url, items)
+
+def extract_from_body(url, html):
+    """Run the extractor chain on an already-fetched body; the first usable result wins"""
+    verdict = prefilter.check(html)
+    if verdict.action == "reject":
+        logger.info(f"Prefilter rejected ({verdict.reason}): {url}")
+        return []
+
+    doc = None
+    if verdict.action != "light":
         try:
-            result = extractor(url)
-            if result and len(result[0]['content']) > CONFIG['min_content_length']:
-                return result
+            article, doc = parse_article(html)
+            items = _article_items(url, article, doc)
+            if items and len(items[0]['content']) > CONFIG['min_content_length']:
+                return items
         except Exception as e:
-            logger.warning(f"Extractor {attempt+1} failed for {url}: {e}")
-    return []
+            logger.warning(f"Goose extractor failed for {url}: {e}")
+    return _extract_paragraphs(url, html, doc)
 
 def validate_and_sanitize_url(url):
     if not url or not isinstance(url, str):
@@ -310,28 +586,36 @@ def setup_structured_logging():
     )
 
 def fallback_bs4_extract(url):
-    """Fallback extractor using BeautifulSoup when Goose fails"""
+    """Fallback extractor: the page's <p> text, for when Goose fails"""
     if not _validate_url(url):
         logger.warning(f"Invalid URL skipped: {url}")
         return []
 
-    headers = {"User-Agent": "Mozilla/5.0 (compatible; SaveAlineBot/1.0)"}
     try:
-        response = session.get(url, headers=headers, timeout=CONFIG['request_timeout'])
-        response.raise_for_status()
+        response = fetch_page(url)
     except Exception as e:
         logger.error(f"BS4 fallback failed to fetch {url}: {e}")
         return []
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    paragraphs = [p.get_text() for p in soup.find_all("p")]
+    return _extract_paragraphs(url, response.text)
+
+def _extract_paragraphs(url, html, doc=None):
+    """Lightweight extraction: the page's <p> text, no Goose.
+
+    `doc` is a ParsedDocument already built for this body, if any.
+    """
+    if doc is None or doc.tree is None:
+        doc = ParsedDocument.from_html(html)
+    if doc.tree is None:
+        return []
+    paragraphs = [p.text_content() for p in doc.tree.iter("p")]
     content = "\n\n".join(paragraphs)
 
     if len(content) < CONFIG['min_content_length']:
         return []
 
     return [{
-        "title": soup.title.string if soup.title else "Untitled",
+        "title": doc.title or "Untitled",
         "content": content,
         "content_type": detect_content_type(url),
         "source_url": url,
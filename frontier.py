@@ -0,0 +1,151 @@
+import heapq
+import hashlib
+import itertools
+import math
+import re
+from collections import namedtuple
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+from canonical import url_key
+
+# kind is "article" (extract it) or "index" (expand it for more links);
+# depth counts toward max_depth, hops (links followed, pagination included)
+# orders the queue
+FrontierEntry = namedtuple("FrontierEntry", "url depth kind lastmod score hops")
+
+STRONG_ARTICLE = re.compile(
+    r"/p/[^/]+/?$|/\d{4}/\d{2}/(\d{2}/)?[^/]+|/(blog|post|posts|article|articles|guides?|learn)/[^/]+/?$"
+)
+ARTICLE_KEYWORDS = ("blog", "post", "article", "story", "interview", "guide")
+INDEX_PATH = re.compile(r"/(category|categories|tag|tags|topics?|archive)(/|$)")
+PAGINATION_PATH = re.compile(r"/page/\d+/?$")
+PAGINATION_QUERY = re.compile(r"(^|&)(page|p|paged)=\d+")
+PAGINATION_TEXT = re.compile(r"older posts|older entries|next page|^next\b|^older\b|load more|»|→", re.IGNORECASE)
+
+
+def normalize_url(url):
+    """Visited-set key: equivalent URLs (tracking params, www, scheme, ...) share one key"""
+    return url_key(url)
+
+
+def is_pagination(url, anchor_text=""):
+    parsed = urlparse(url)
+    return bool(PAGINATION_PATH.search(parsed.path) or PAGINATION_QUERY.search(parsed.query)
+                or PAGINATION_TEXT.search(anchor_text.strip()))
+
+
+def classify_link(url, anchor_text=""):
+    """Return (kind, confidence) for a link found on an index page, or (None, 0)"""
+    if is_pagination(url, anchor_text):
+        return "index", 0.9
+    path = urlparse(url).path.lower()
+    if INDEX_PATH.search(path):
+        return "index", 0.6
+    if STRONG_ARTICLE.search(path):
+        return "article", 1.0
+    if "substack.com/p/" in url or any(keyword in url.lower() for keyword in ARTICLE_KEYWORDS):
+        return "article", 0.5
+    return None, 0
+
+
+def freshness(lastmod, now=None, half_life_days=30):
+    """0..1 bonus that halves every half_life_days since lastmod (0 when unknown)"""
+    if not lastmod:
+        return 0.0
+    try:
+        when = datetime.fromisoformat(lastmod)
+    except ValueError:
+        return 0.0
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    age_days = max(0.0, ((now or datetime.now(timezone.utc)) - when).total_seconds() / 86400)
+    return math.pow(0.5, age_days / half_life_days)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one blake2b digest"""
+
+    def __init__(self, capacity=1000000, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class VisitedSet:
+    """Exact set for the first exact_limit URLs, then a Bloom filter.
+
+    Small crawls never see a false positive; big ones stop growing in memory
+    at the cost of occasionally skipping an unseen URL (error_rate).
+    """
+
+    def __init__(self, exact_limit=50000, bloom_capacity=1000000, error_rate=0.001):
+        self.exact_limit = exact_limit
+        self._exact = set()
+        self._bloom = None
+        self._bloom_args = (bloom_capacity, error_rate)
+
+    def __contains__(self, url):
+        key = normalize_url(url)
+        return key in self._exact or (self._bloom is not None and key in self._bloom)
+
+    def add(self, url):
+        key = normalize_url(url)
+        if len(self._exact) < self.exact_limit:
+            self._exact.add(key)
+            return
+        if self._bloom is None:
+            self._bloom = BloomFilter(*self._bloom_args)
+        self._bloom.add(key)
+
+
+class CrawlFrontier:
+    """Priority queue of URLs to crawl, best first.
+
+    Score = link-pattern confidence + freshness bonus - hop penalty (hops
+    defaults to depth; pagination can add hops without adding depth). Each
+    URL is admitted once (VisitedSet); URLs deeper than max_depth are
+    refused, and so are index pages at max_depth, since none of their
+    links could be followed; when more than max_size entries are queued
+    the lowest-scoring ones are dropped.
+    """
+
+    DEPTH_PENALTY = 0.3
+
+    def __init__(self, max_depth=2, max_size=10000, visited=None):
+        self.max_depth = max_depth
+        self.max_size = max_size
+        self.visited = visited if visited is not None else VisitedSet()
+        self._heap = []
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, url, depth, kind, confidence=1.0, lastmod=None, hops=None):
+        if depth > self.max_depth or (kind == "index" and depth >= self.max_depth) or url in self.visited:
+            return False
+        self.visited.add(url)
+        hops = depth if hops is None else hops
+        score = confidence + freshness(lastmod) - self.DEPTH_PENALTY * hops
+        heapq.heappush(self._heap, (-score, next(self._counter), FrontierEntry(url, depth, kind, lastmod, score, hops)))
+        if len(self._heap) > self.max_size * 1.25:
+            self._heap = heapq.nsmallest(self.max_size, self._heap)
+            heapq.heapify(self._heap)
+        return True
+
+    def pop(self):
+        return heapq.heappop(self._heap)[2]
@@ -0,0 +1,191 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+import structlog
+
+import metrics
+from http_client import get_with_retry
+
+logger = structlog.get_logger("SaveAlineScraper")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL,
+    items TEXT,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+"""
+
+# url is where the request ended up after redirects; text is the page body
+# (fresh or from the cache); items holds extraction results saved for this
+# URL when the server answered 304 Not Modified.
+FetchResult = namedtuple("FetchResult", "url status text not_modified items headers")
+
+
+class HTTPCache:
+    """On-disk HTTP response cache with ETag/Last-Modified revalidation.
+
+    Bodies are zlib-compressed into a SQLite file under `directory`. When the
+    total size passes `max_bytes`, the least recently used entries are evicted.
+    The total is kept as a running sum, recounted from the table only when
+    it passes the cap (other processes may share the file).
+    Callers can attach their extraction results to an entry with
+    store_items(); on a 304 those are returned as-is so extraction is skipped.
+    """
+
+    def __init__(self, directory, max_bytes=200 * 1024 * 1024):
+        os.makedirs(directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directory, "http_cache.db"), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._total = self._count_size()
+
+    def conditional_headers(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return {}
+        headers = {}
+        if row[0]:
+            headers["If-None-Match"] = row[0]
+        if row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def lookup(self, url, kind):
+        """Return (body, items) for a cached URL and mark it recently used"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT body, items FROM entries WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None, None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (time.time(), url))
+        items = json.loads(row[1]).get(kind) if row[1] else None
+        return zlib.decompress(row[0]).decode("utf-8"), items
+
+    def store(self, url, text, headers):
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            # Nothing to revalidate with; drop any stale copy
+            with self._lock, self._conn:
+                self._total -= self._entry_size(url)
+                self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            return
+        body = zlib.compress(text.encode("utf-8"))
+        with self._lock, self._conn:
+            self._total -= self._entry_size(url)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (url, etag, last_modified, body, items, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, NULL, ?, ?)",
+                (url, etag, last_modified, body, len(body), time.time())
+            )
+            self._total += len(body)
+            self._evict()
+
+    def store_items(self, url, kind, items):
+        """Attach extraction results (a JSON-serializable list) to a cached URL"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT items, length(body), size FROM entries WHERE url = ?",
+                                     (url,)).fetchone()
+            if row is None:
+                return
+            stored = json.loads(row[0]) if row[0] else {}
+            stored[kind] = items
+            encoded = json.dumps(stored)
+            self._conn.execute(
+                "UPDATE entries SET items = ?, size = ? WHERE url = ?", (encoded, row[1] + len(encoded), url)
+            )
+            self._total += row[1] + len(encoded) - row[2]
+            self._evict()
+
+    def _count_size(self):
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _entry_size(self, url):
+        row = self._conn.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else 0
+
+    def _evict(self):
+        if self._total <= self.max_bytes:
+            return
+        total = self._count_size()
+        if total <= self.max_bytes:
+            self._total = total
+            return
+        evicted = 0
+        for url, size in self._conn.execute("SELECT url, size FROM entries ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            total -= size
+            evicted += 1
+        self._total = total
+        logger.info(f"HTTP cache evicted {evicted} entries")
+
+    def _result(self, url, status, text, headers, kind):
+        if status == 304:
+            body, items = self.lookup(url, kind)
+            if body is not None:
+                self.hits += 1
+                return FetchResult(url, status, body, True, items, headers)
+            return FetchResult(url, status, text, False, None, headers)
+        self.misses += 1
+        self.store(url, text, headers)
+        return FetchResult(url, status, text, False, None, headers)
+
+
+def cached_get(session, url, cache=None, kind="page", headers=None, revalidate=True, **kwargs):
+    """requests GET that revalidates against `cache` when one is configured"""
+    request_headers = dict(headers or {})
+    if cache and revalidate:
+        request_headers.update(cache.conditional_headers(url))
+    metrics.inc("http_requests", kind)
+    response = session.get(url, headers=request_headers, **kwargs)
+    if response.status_code != 304:
+        response.raise_for_status()
+    if not cache:
+        return FetchResult(response.url, response.status_code, response.text, False, None, response.headers)
+    result = cache._result(url, response.status_code, response.text, response.headers, kind)
+    if revalidate and result.status == 304 and not result.not_modified:
+        # Entry was evicted between the lookup and the response
+        return cached_get(session, url, cache, kind, headers, revalidate=False, **kwargs)
+    return result._replace(url=response.url)
+
+
+async def cached_get_async(session, url, cache=None, kind="page", headers=None, revalidate=True, retry=None,
+                           breaker=None, limiter=None, scheduler=None, **kwargs):
+    """aiohttp counterpart of cached_get; `retry`, `breaker`, `limiter` and `scheduler` go to get_with_retry"""
+    request_headers = dict(headers or {})
+    if cache and revalidate:
+        request_headers.update(cache.conditional_headers(url))
+    metrics.inc("http_requests", kind)
+    async with get_with_retry(session, url, retry, breaker, limiter, scheduler, headers=request_headers,
+                              **kwargs) as response:
+        if response.status != 304:
+            response.raise_for_status()
+        text = await response.text() if response.status != 304 else ""
+        final_url = str(response.url)
+        if not cache:
+            return FetchResult(final_url, response.status, text, False, None, response.headers)
+        result = cache._result(url, response.status, text, response.headers, kind)
+    if revalidate and result.status == 304 and not result.not_modified:
+        return await cached_get_async(session, url, cache, kind, headers, revalidate=False, retry=retry,
+                                      breaker=breaker, limiter=limiter, scheduler=scheduler, **kwargs)
+    return result._replace(url=final_url)
@@ -0,0 +1,280 @@
+import asyncio
+import random
+from contextlib import asynccontextmanager, nullcontext
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import aiohttp
+import requests
+import structlog
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+import metrics
+
+logger = structlog.get_logger("SaveAlineScraper")
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Event loop -> its long-lived aiohttp session (see get_async_session)
+_async_sessions = {}
+
+
+class _CountingPool:
+    """Counts new connections and requests (retries included) under "http_pool".
+
+    requests minus connections_opened is how many requests reused a
+    kept-alive connection.
+    """
+
+    def _new_conn(self):
+        metrics.inc("http_pool", "connections_opened")
+        return super()._new_conn()
+
+    def urlopen(self, *args, **kwargs):
+        metrics.inc("http_pool", "requests")
+        return super().urlopen(*args, **kwargs)
+
+
+class CountingHTTPConnectionPool(_CountingPool, HTTPConnectionPool):
+    pass
+
+
+class CountingHTTPSConnectionPool(_CountingPool, HTTPSConnectionPool):
+    pass
+
+
+def is_host_failure(status):
+    """Statuses that count against a host's circuit breaker"""
+    return status == 429 or status >= 500
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose per-host pools report connection reuse to metrics.
+
+    With a `breaker` (circuit_breaker.CircuitBreaker), requests to hosts
+    whose circuit is open fail fast and each outcome is recorded.
+    """
+
+    def __init__(self, *args, breaker=None, **kwargs):
+        self.breaker = breaker
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, *args, **kwargs):
+        if self.breaker is None:
+            return super().send(request, *args, **kwargs)
+        self.breaker.check(request.url)
+        try:
+            response = super().send(request, *args, **kwargs)
+        except Exception:
+            self.breaker.record_failure(request.url)
+            raise
+        if is_host_failure(response.status_code):
+            self.breaker.record_failure(request.url)
+        else:
+            self.breaker.record_success(request.url)
+        return response
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+
+class CountingRetry(Retry):
+    """Retry that counts each retry it allows under "http_retries", by host"""
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        new_retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        metrics.inc("http_retries", _pool.host if _pool else None)
+        return new_retry
+
+
+def build_retry(config):
+    """The retry policy every sync fetch shares"""
+    return CountingRetry(
+        total=config['max_retries'],
+        backoff_factor=config['http_backoff_factor'],
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=["HEAD", "GET", "OPTIONS"],
+        respect_retry_after_header=True,
+    )
+
+
+def build_session(config, headers=None, breaker=None):
+    """A keep-alive requests.Session with pooled, per-host capped connections.
+
+    One connection pool is kept for each of up to http_pool_hosts hosts,
+    each holding at most http_pool_per_host connections; with
+    http_pool_block, extra threads wait for a free connection instead of
+    opening more. Responses are decoded from gzip/deflate, and brotli too
+    when the brotli package is installed. `breaker` guards every host.
+    """
+    session = requests.Session()
+    adapter = PooledAdapter(
+        pool_connections=config['http_pool_hosts'],
+        pool_maxsize=config['http_pool_per_host'],
+        pool_block=config['http_pool_block'],
+        max_retries=build_retry(config),
+        breaker=breaker,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive"})
+    session.headers.update(headers or {})
+    return session
+
+
+def retry_after_seconds(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class AsyncRetry:
+    """Retry policy for aiohttp fetches, matching the sync one.
+
+    Up to `total` retries on connection errors, timeouts and RETRY_STATUSES.
+    The wait before retry n is drawn uniformly from 0 to backoff_factor * 2^n
+    (full jitter, so clients that failed together do not retry together),
+    unless the response sent Retry-After, which is obeyed. Backoff waits are
+    capped at max_backoff; a Retry-After longer than that is not cut short
+    but ends the retries, and the response is returned as is.
+    """
+
+    def __init__(self, total=3, backoff_factor=1, max_backoff=60, statuses=RETRY_STATUSES):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            total=config['max_retries'],
+            backoff_factor=config['http_backoff_factor'],
+            max_backoff=config['http_max_backoff'],
+        )
+
+    def backoff(self, attempt, retry_after=None):
+        """Seconds to wait before retry `attempt`, or None to give up"""
+        seconds = retry_after_seconds(retry_after)
+        if seconds is not None:
+            return seconds if seconds <= self.max_backoff else None
+        return min(random.uniform(0, self.backoff_factor * 2 ** attempt), self.max_backoff)
+
+
+@asynccontextmanager
+async def get_with_retry(session, url, retry=None, breaker=None, limiter=None, scheduler=None, **kwargs):
+    """`async with session.get(url)`, retried according to `retry` (an AsyncRetry).
+
+    With a `breaker`, an open host raises CircuitOpenError before any
+    request and the final outcome is recorded against the host. With a
+    `limiter` (concurrency.AdaptiveConcurrency), each attempt holds one of
+    the host's slots until its response is released; backoff waits hold
+    none, and every retried 429/5xx or connection error counts as overload.
+    A `scheduler` (politeness.HostScheduler) slot is taken only once the
+    attempt holds its concurrency slot, so requests that queued for a slot
+    still leave spaced out.
+    """
+    if breaker is not None:
+        breaker.check(url)
+    host = urlparse(url).netloc
+    attempt = 0
+    while True:
+        async with limiter.slot(url) if limiter is not None else nullcontext() as slot:
+            if scheduler is not None:
+                await scheduler.wait_async(url)
+                if slot is not None:
+                    slot.restart()
+            try:
+                response = await session.get(url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if retry is None or attempt >= retry.total:
+                    if breaker is not None:
+                        breaker.record_failure(url)
+                    raise
+                delay = retry.backoff(attempt)
+                if slot is not None:
+                    slot.overloaded(type(e).__name__)
+            else:
+                delay = None
+                if retry is not None and response.status in retry.statuses and attempt < retry.total:
+                    delay = retry.backoff(attempt, response.headers.get("Retry-After"))
+                if delay is None:
+                    if breaker is not None:
+                        if is_host_failure(response.status):
+                            breaker.record_failure(url)
+                        else:
+                            breaker.record_success(url)
+                    try:
+                        yield response
+                    finally:
+                        response.release()
+                    return
+                response.release()
+                if slot is not None:
+                    slot.overloaded(f"HTTP {response.status}")
+        attempt += 1
+        metrics.inc("http_retries", host)
+        logger.info(f"Retry {attempt} for {url} in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+
+def build_connector(config):
+    """TCPConnector with a DNS cache, capped per host at the adaptive concurrency ceiling"""
+    return aiohttp.TCPConnector(
+        limit=config['http_pool_total'],
+        limit_per_host=config['concurrency_ceiling'],
+        ttl_dns_cache=config['dns_cache_ttl'],
+    )
+
+
+def open_async_session(config):
+    """A new aiohttp session on build_connector(config); the caller closes it"""
+    return aiohttp.ClientSession(connector=build_connector(config))
+
+
+def get_async_session(config):
+    """The running event loop's long-lived aiohttp session, created on first use.
+
+    Its connections and DNS entries are reused across crawls. Close it with
+    close_async_session() before the loop ends; entries left behind by
+    loops that have since closed are dropped here.
+    """
+    loop = asyncio.get_running_loop()
+    for dead in [other for other in _async_sessions if other.is_closed()]:
+        del _async_sessions[dead]
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        session = open_async_session(config)
+        _async_sessions[loop] = session
+    return session
+
+
+def has_async_session():
+    """True if the running loop already has an open long-lived session"""
+    session = _async_sessions.get(asyncio.get_running_loop())
+    return session is not None and not session.closed
+
+
+async def close_async_session():
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
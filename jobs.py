@@ -0,0 +1,169 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    discovered INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    worker TEXT,
+    lease_expires REAL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    item TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+"""
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobStore:
+    """Background scrape jobs and their results, kept in a local SQLite file.
+
+    Several processes (e.g. uvicorn workers) can share one file. A job is
+    run by whichever worker claims it; the claim is a lease of
+    lease_seconds that the worker renews while it runs. A worker that stops
+    cleanly releases its job back to the queue; a running job whose lease
+    has lapsed (its worker died) can be claimed again.
+    """
+
+    def __init__(self, path="jobs.db", lease_seconds=300, worker_id=None):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def _now(self):
+        return datetime.now().isoformat()
+
+    def create(self, params):
+        job_id = uuid.uuid4().hex
+        now = self._now()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, params, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(params), now, now)
+            )
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        return job
+
+    def update_progress(self, job_id, discovered, done, failed):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET discovered = ?, done = ?, failed = ?, updated_at = ? WHERE id = ?",
+                (discovered, done, failed, self._now(), job_id)
+            )
+
+    def add_item(self, job_id, item):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO job_items (job_id, seq, item) "
+                "VALUES (?, (SELECT COALESCE(MAX(seq), -1) + 1 FROM job_items WHERE job_id = ?), ?)",
+                (job_id, job_id, json.dumps(item))
+            )
+
+    def count_items(self, job_id):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM job_items WHERE job_id = ?", (job_id,)).fetchone()[0]
+
+    def get_items(self, job_id, offset=0, limit=20):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item FROM job_items WHERE job_id = ? ORDER BY seq LIMIT ? OFFSET ?",
+                (job_id, limit, offset)
+            ).fetchall()
+        return [json.loads(row["item"]) for row in rows]
+
+    def done_urls(self, job_id):
+        """source_urls that already have a stored item"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT json_extract(item, '$.source_url') AS url FROM job_items WHERE job_id = ?",
+                (job_id,)
+            ).fetchall()
+        return {row["url"] for row in rows if row["url"]}
+
+    def claimable(self):
+        """Ids of jobs waiting for a worker, oldest first: queued, or running on a lapsed lease"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? OR (status = ? AND COALESCE(lease_expires, 0) < ?) "
+                "ORDER BY created_at",
+                (QUEUED, RUNNING, time.time())
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def claim(self, job_id):
+        """Atomically take the job for this worker; False if another worker holds it or it has ended"""
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND (status = ? OR (status = ? AND COALESCE(lease_expires, 0) < ?))",
+                (RUNNING, self.worker_id, now + self.lease_seconds, self._now(), job_id, QUEUED, RUNNING, now)
+            )
+        return cursor.rowcount == 1
+
+    def renew(self, job_id):
+        """Extend this worker's lease on a running job; False if the job is no longer ours"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = ? AND worker = ?",
+                (time.time() + self.lease_seconds, job_id, RUNNING, self.worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def finish(self, job_id, status, error=None):
+        """Record a claimed job's final status and release it; False if the job is no longer ours"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND status = ? AND worker = ?",
+                (status, error, self._now(), job_id, RUNNING, self.worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def release(self, job_id):
+        """Hand a running job back to the queue (e.g. on shutdown); False if the job is no longer ours"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND status = ? AND worker = ?",
+                (QUEUED, self._now(), job_id, RUNNING, self.worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
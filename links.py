@@ -0,0 +1,86 @@
+import re
+from urllib.parse import urljoin, urlparse
+
+from lxml import etree
+
+from canonical import canonicalize_url, url_key
+
+# Blog post URL shapes, as one alternation so each path is scanned once
+POST_PATH = re.compile(
+    r"/blog/[^/]+/?$"
+    r"|/post/[^/]+/?$"
+    r"|/article/[^/]+/?$"
+    r"|/\d{4}/\d{2}/\d{2}/"
+    r"|/p/[^/]+/?$"        # Substack
+    r"|/guides/[^/]+/?$"   # Interview guides
+    r"|/topics/[^/]+/?$"   # Company topics
+    r"|/learn/[^/]+/?$"    # Learning materials
+)
+
+# Extra per-site rules, matched against the raw href and not limited to the
+# index page's own domain
+DOMAIN_RULES = {
+    "substack.com": re.compile(r"/p/"),
+    "interviewing.io": re.compile(r"/(?:blog|guides|topics|learn)/"),
+}
+
+
+class _AnchorCollector:
+    """lxml parser target that keeps only <a href> and its text; no tree is built"""
+
+    def __init__(self):
+        self.links = []
+        self._href = None
+        self._text = []
+
+    def start(self, tag, attrib):
+        if tag == "a":
+            self._href = attrib.get("href")
+            self._text = []
+
+    def data(self, data):
+        if self._href is not None:
+            self._text.append(data)
+
+    def end(self, tag):
+        if tag == "a" and self._href is not None:
+            self.links.append((self._href, " ".join("".join(self._text).split())))
+            self._href = None
+
+    def close(self):
+        return self.links
+
+
+def extract_anchors(html):
+    """(href, anchor_text) for every <a href> in html, in document order"""
+    if not html:
+        return []
+    encoding = None
+    if isinstance(html, str):
+        # Already decoded; stop lxml re-guessing the charset from <meta>
+        html, encoding = html.encode("utf-8", errors="replace"), "utf-8"
+    parser = etree.HTMLParser(target=_AnchorCollector(), recover=True, encoding=encoding)
+    parser.feed(html)
+    return parser.close()
+
+
+def find_post_urls(base_url, html):
+    """Blog post URLs linked from an index page, canonicalized, in page order.
+
+    A link qualifies if it is on the index page's domain and its path looks
+    like a post (POST_PATH), or if the index page's site has a DOMAIN_RULES
+    entry matching the href. The index page itself is never returned.
+    """
+    base_domain = urlparse(base_url).netloc
+    base = url_key(base_url)
+    site_rule = next((rule for site, rule in DOMAIN_RULES.items() if site in base_url), None)
+
+    urls = {}
+    for href, _ in extract_anchors(html):
+        full_url = urljoin(base_url, href)
+        parsed = urlparse(full_url)
+        if (parsed.netloc == base_domain and POST_PATH.search(parsed.path)) or (site_rule and site_rule.search(href)):
+            key = url_key(full_url)
+            if key != base:
+                urls.setdefault(key, canonicalize_url(full_url))
+    return list(urls.values())
@@ -1,6 +1,8 @@
 import argparse
 import os
-from extractor import extract_from_url, extract_from_pdf, extract_from_blog_index, is_index_page
+from extractor import extract_from_url, extract_from_pdf, extract_from_blog_index, is_index_page, CONFIG
+from extraction_pool import get_executor
+from resume_utils import load_url_records, save_url_records
 from formatter import format_items
 import json
 
@@ -22,21 +24,30 @@ def main():
     parser.add_argument("--url", type=str, help="Blog or index URL")
     parser.add_argument("--pdf", type=str, help="Path to PDF")
     parser.add_argument("--team_id", type=str, default=TEAM_ID, help="Team ID")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only fetch and extract posts that are new or changed since the last run")
     args = parser.parse_args()
 
     items = []
 
     if args.url:
         if is_index_page(args.url):
-            items += extract_from_blog_index(args.url)
+            items += extract_from_blog_index(args.url, incremental=args.incremental)
+        elif args.incremental:
+            records = load_url_records(CONFIG['checkpoint_file'])
+            items += extract_from_url(args.url, records.setdefault(args.url, {}))
+            save_url_records(records, CONFIG['checkpoint_file'])
         else:
             items += extract_from_url(args.url)
 
     if args.pdf:
-        items += extract_from_pdf(args.pdf)
+        items += extract_from_pdf(args.pdf, executor=get_executor())
 
     if not items:
-        print("⚠️ No content extracted. Provide --url or --pdf.")
+        if args.incremental:
+            print("✅ Nothing new or changed since the last run.")
+        else:
+            print("⚠️ No content extracted. Provide --url or --pdf.")
         return
 
     save_output(format_items(items))
@@ -1,20 +1,54 @@
-from fastapi import FastAPI, Request, HTTPException, UploadFile, File, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
-from typing import Optional, List
-import requests
-from bs4 import BeautifulSoup
+from typing import Optional, List, Tuple
 import html2text
-import re
-from urllib.parse import urljoin, urlparse
+import json
 from datetime import datetime
 import logging
-from io import BytesIO
-from pdfminer.high_level import extract_text
+import os
+import tempfile
+from itertools import islice
 import asyncio
 import aiohttp
 from goose3 import Goose
+from lxml import html as lxml_html
 import structlog
+from extraction_pool import get_executor
+from pdf_stream import chunk_pages, iter_pages
+from chunking import iter_chunks
+import metrics
+from extractor import (
+    CONFIG,
+    prefilter,
+    http_cache,
+    robots_cache,
+    session as http_session,
+    async_retry,
+    async_session,
+    host_breaker,
+    host_concurrency,
+    scheduler,
+    conditional_headers,
+    update_url_record
+)
+from resume_utils import load_url_records, save_url_records, lastmod_unchanged
+from discovery import DiscoveredURL, discover_urls
+from document import ParsedDocument
+from canonical import SeenURLs, canonical_link, unique_urls
+from links import find_post_urls
+from http_cache import FetchResult, cached_get, cached_get_async
+from http_client import close_async_session
+from jobs import JobStore, SUCCEEDED, FAILED
+try:
+    from python_multipart import MultipartParser
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import parse_options_header
+except ModuleNotFoundError:  # python-multipart before 0.0.13
+    from multipart import MultipartParser
+    from multipart.exceptions import MultipartParseError
+    from multipart.multipart import parse_options_header
 
 app = FastAPI(title="Aline Scraper API", version="2.0")
 logging.basicConfig(level=logging.INFO)
@@ -26,11 +60,17 @@ class ScrapedItem(BaseModel):
     source_url: Optional[str] = None
     author: str = ""
     user_id: str = ""
+    page_start: Optional[int] = None
+    page_end: Optional[int] = None
 
 class ScrapedResponse(BaseModel):
     team_id: str
     items: List[ScrapedItem]
 
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
 class BlogScraper:
     def __init__(self):
         self.html2text_converter = html2text.HTML2Text()
@@ -39,106 +79,40 @@ class BlogScraper:
         self.html2text_converter.body_width = 0
         self.goose = Goose()
 
-    def get_page_content(self, url: str) -> BeautifulSoup:
-        """Get page content with proper error handling"""
+    def fetch_html(self, url: str) -> str:
+        """Get a page's HTML with proper error handling"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-            return BeautifulSoup(response.text, "html.parser")
+            return cached_get(http_session, url, http_cache, headers=HEADERS, timeout=15).text
         except Exception as e:
             logging.error(f"Failed to fetch {url}: {e}")
             raise Exception(f"Failed to fetch {url}: {e}")
 
-    def find_blog_post_urls(self, base_url: str, soup: BeautifulSoup) -> List[str]:
-        """Find all blog post URLs from a blog homepage"""
-        urls = set()
-        base_domain = urlparse(base_url).netloc
-        
-        # Common blog URL patterns
-        blog_patterns = [
-            r'/blog/[^/]+/?$',
-            r'/post/[^/]+/?$',
-            r'/article/[^/]+/?$',
-            r'/\d{4}/\d{2}/\d{2}/',
-            r'/p/[^/]+/?$',  # Substack
-            r'/guides/[^/]+/?$',  # Interview guides
-            r'/topics/[^/]+/?$',  # Company topics
-            r'/learn/[^/]+/?$',   # Learning materials
-        ]
-        
-        # Find all links
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
-            if not href:
-                continue
-                
-            # Convert relative URLs to absolute
-            full_url = urljoin(base_url, href)
-            parsed_url = urlparse(full_url)
-            
-            # Only include URLs from the same domain
-            if parsed_url.netloc != base_domain:
-                continue
-            
-            # Check if URL matches blog patterns
-            for pattern in blog_patterns:
-                if re.search(pattern, parsed_url.path):
-                    urls.add(full_url)
-                    break
-        
-        # Special handling for different platforms
-        if 'substack.com' in base_url:
-            urls.update(self._find_substack_urls(soup, base_url))
-        elif 'interviewing.io' in base_url:
-            urls.update(self._find_interviewing_io_urls(soup, base_url))
-        
-        return list(urls)
-
-    def _find_substack_urls(self, soup: BeautifulSoup, base_url: str) -> set:
-        """Find Substack-specific post URLs"""
-        urls = set()
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
-            if '/p/' in href:
-                urls.add(urljoin(base_url, href))
-        return urls
-
-    def _find_interviewing_io_urls(self, soup: BeautifulSoup, base_url: str) -> set:
-        """Find interviewing.io specific URLs"""
-        urls = set()
-        
-        # Look for various content types
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
-            if any(pattern in href for pattern in ['/blog/', '/guides/', '/topics/', '/learn/']):
-                full_url = urljoin(base_url, href)
-                if full_url != base_url:  # Don't include the base URL itself
-                    urls.add(full_url)
-        
-        return urls
+    def find_blog_post_urls(self, base_url: str, html: str) -> List[str]:
+        """Find all blog post URLs from a blog homepage.
 
-    def extract_content_with_goose(self, url: str) -> Optional[ScrapedItem]:
-        """Extract content using Goose3 for better accuracy"""
-        try:
-            article = self.goose.extract(url=url)
-            if article.cleaned_text and len(article.cleaned_text.strip()) > 100:
-                return ScrapedItem(
-                    title=article.title or "Untitled",
-                    content=article.cleaned_text,
-                    content_type="blog",
-                    source_url=url,
-                    author=article.authors[0] if article.authors else ""
-                )
-        except Exception as e:
-            logging.error(f"Goose extraction failed for {url}: {e}")
-        return None
+        Only <a href> tags are parsed, and links are matched in a single pass
+        (see links.find_post_urls for the patterns and per-site rules).
+        """
+        return find_post_urls(base_url, html)
+
+    def discover_feed_urls(self, base_url: str, html: str) -> List[DiscoveredURL]:
+        """Post URLs from RSS/Atom feeds or sitemaps, newest first ([] if the site has none)"""
+        return discover_urls(base_url, http_session, robots_cache, html, HEADERS, 15)
+
+    def extract_content_fallback(self, url: str, html: str,
+                                 doc: Optional[ParsedDocument] = None) -> Optional[ScrapedItem]:
+        """Fallback content extraction from the page's lxml tree.
 
-    def extract_content_fallback(self, url: str, soup: BeautifulSoup) -> Optional[ScrapedItem]:
-        """Fallback content extraction using BeautifulSoup"""
+        `doc` is the ParsedDocument already built for `html` (e.g. from the
+        tree Goose parsed); without one the body is parsed here.
+        """
         try:
+            if doc is None:
+                doc = ParsedDocument.from_html(html)
+            tree = doc.tree
+            if tree is None:
+                return None
+
             # Try to find main content area
             content_selectors = [
                 'article', 'main', '.content', '.post-content', 
@@ -147,21 +121,24 @@ class BlogScraper:
             
             content_element = None
             for selector in content_selectors:
-                content_element = soup.select_one(selector)
-                if content_element:
+                found = tree.cssselect(selector)
+                if found:
+                    content_element = found[0]
                     break
             
-            if not content_element:
+            if content_element is None:
                 # Use the body as fallback
-                content_element = soup.find('body')
+                body = tree.xpath('//body')
+                content_element = body[0] if body else None
             
-            if content_element:
-                # Find title
-                title_element = soup.find(['h1', 'h2']) or content_element.find(['h1', 'h2'])
-                title = title_element.get_text(strip=True) if title_element else "Untitled"
+            if content_element is not None:
+                # Find title (the first h1 or h2 in the page)
+                title_elements = tree.xpath('//h1 | //h2')
+                title = title_elements[0].text_content().strip() if title_elements else "Untitled"
                 
                 # Convert to markdown
-                markdown_content = self.html2text_converter.handle(str(content_element))
+                markdown_content = self.html2text_converter.handle(
+                    lxml_html.tostring(content_element, encoding="unicode", with_tail=False))
                 
                 if len(markdown_content.strip()) > 100:
                     return ScrapedItem(
@@ -177,27 +154,180 @@ class BlogScraper:
         return None
 
     def scrape_single_url(self, url: str) -> Optional[ScrapedItem]:
-        """Scrape content from a single URL"""
-        # First try with Goose3
-        item = self.extract_content_with_goose(url)
-        if item:
-            return item
-        
-        # Fallback to BeautifulSoup
+        """Scrape content from a single URL, fetching it once for every extractor"""
         try:
-            soup = self.get_page_content(url)
-            return self.extract_content_fallback(url, soup)
+            html = self.fetch_html(url)
         except Exception as e:
             logging.error(f"Failed to scrape {url}: {e}")
             return None
 
+        verdict = prefilter.check(html)
+        if verdict.action == "reject":
+            logging.info(f"Prefilter rejected ({verdict.reason}): {url}")
+            return None
+        return self.extract_from_html(url, html, light=verdict.action == "light")
+
+    def extract_from_html(self, url: str, html: str, light: bool = False) -> Optional[ScrapedItem]:
+        """Extract an already-fetched page: Goose3 first (unless light), lxml fallback.
+
+        The fallback reads the tree Goose already parsed, so the body is
+        parsed once either way.
+        """
+        if light:
+            return self.extract_content_fallback(url, html)
+        # Goose gets the body, never the URL: extraction must not fetch again
+        doc = None
+        try:
+            article = self.goose.extract(raw_html=html)
+            doc = ParsedDocument.from_article(article)
+            if article.cleaned_text and len(article.cleaned_text.strip()) > 100:
+                return ScrapedItem(
+                    title=article.title or "Untitled",
+                    content=article.cleaned_text,
+                    content_type="blog",
+                    source_url=url,
+                    author=article.authors[0] if article.authors else ""
+                )
+        except Exception as e:
+            logging.error(f"Goose extraction failed for {url}: {e}")
+
+        return self.extract_content_fallback(url, html, doc)
+
+    async def fetch_page_async(self, session: aiohttp.ClientSession, url: str, kind: str = "page",
+                               headers: Optional[dict] = None) -> FetchResult:
+        """Fetch a page without blocking the event loop, revalidating against the HTTP cache"""
+        timeout = aiohttp.ClientTimeout(total=15)
+        return await cached_get_async(session, url, http_cache, kind, headers={**HEADERS, **(headers or {})},
+                                      retry=async_retry, breaker=host_breaker,
+                                      limiter=host_concurrency, scheduler=scheduler, timeout=timeout)
+
+    async def iter_blog_async(self, url: str, max_pages: int = 50, max_concurrent: int = 5,
+                              stats: Optional[dict] = None, incremental: bool = False,
+                              skip_urls: frozenset = frozenset()):
+        """Crawl a blog concurrently, yielding ScrapedItems as posts finish.
+
+        Post fetches overlap up to max_concurrent, and within that up to the
+        host's adaptive limit (extractor.host_concurrency); link discovery
+        and extraction run in the shared extraction process pool. If given,
+        `stats` is kept up to date with discovered/done/failed counts.
+        With incremental=True, posts whose lastmod, ETag or content hash
+        match the checkpoint are skipped and counted as unchanged. Posts in
+        skip_urls (already extracted by an interrupted job) are counted as
+        done without being fetched again.
+        """
+        if stats is None:
+            stats = {}
+        stats.update(discovered=0, done=0, failed=0, unchanged=0)
+        loop = asyncio.get_running_loop()
+        executor = get_executor()
+        semaphore = asyncio.Semaphore(max_concurrent)
+        records = load_url_records(CONFIG['checkpoint_file']) if incremental else {}
+        seen = SeenURLs()
+
+        async def scrape_post(session, post):
+            record = records.setdefault(post.url, {}) if incremental else None
+            if lastmod_unchanged(record, post.lastmod):
+                stats["unchanged"] += 1
+                return None
+            try:
+                async with semaphore:
+                    page = await self.fetch_page_async(session, post.url, kind="post",
+                                                       headers=conditional_headers(record))
+                if record is not None and page.status == 304:
+                    record["lastmod"] = post.lastmod
+                    stats["unchanged"] += 1
+                    return None
+                if not seen.claim_aliases(post.url, page.url, canonical_link(page.url, page.text)):
+                    logging.info(f"Same canonical page as an earlier URL, skipping: {post.url}")
+                    return None
+                if page.items is not None:
+                    # 304 Not Modified: skip extraction entirely
+                    item = page.items[0] if page.items else None
+                else:
+                    verdict = prefilter.check(page.text)
+                    if verdict.action == "reject":
+                        logging.info(f"Prefilter rejected ({verdict.reason}): {post.url}")
+                        item = None
+                    else:
+                        item = await loop.run_in_executor(executor, _extract_post, post.url, page.text,
+                                                          verdict.action == "light")
+                    if http_cache:
+                        http_cache.store_items(post.url, "post", [item] if item else [])
+            except Exception as e:
+                logging.error(f"Failed to scrape {post.url}: {e}")
+                item = None
+            else:
+                if record is not None:
+                    changed = update_url_record(record, page.headers, item["content"] if item else "")
+                    record["lastmod"] = post.lastmod
+                    if not changed:
+                        stats["unchanged"] += 1
+                        return None
+            stats["done" if item else "failed"] += 1
+            return ScrapedItem(**item) if item else None
+
+        session = async_session()
+        index_html = (await self.fetch_page_async(session, url)).text
+        # Feeds/sitemaps first (blocking XML fetches, so in a thread), then HTML links
+        posts = await asyncio.to_thread(self.discover_feed_urls, url, index_html)
+        if not posts:
+            post_urls = await loop.run_in_executor(executor, _discover_posts, url, index_html)
+            posts = [DiscoveredURL(post_url, None) for post_url in post_urls]
+
+        if not posts:
+            # If no post URLs found, scrape the main page itself
+            stats["discovered"] = 1
+            if url in skip_urls:
+                stats["done"] = 1
+                return
+            item = await loop.run_in_executor(executor, _extract_post, url, index_html)
+            stats["done" if item else "failed"] += 1
+            if item:
+                yield ScrapedItem(**item)
+            return
+
+        posts = [post for post in posts if seen.claim(post.url)][:max_pages]
+        stats["discovered"] = len(posts)
+        if skip_urls:
+            stats["done"] = sum(post.url in skip_urls for post in posts)
+            posts = [post for post in posts if post.url not in skip_urls]
+        tasks = [asyncio.ensure_future(scrape_post(session, post)) for post in posts]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                if item:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if incremental:
+            save_url_records(records, CONFIG['checkpoint_file'])
+
+    async def scrape_blog_async(self, url: str, team_id: str = "aline123", max_pages: int = 50,
+                                max_concurrent: int = 5, incremental: bool = False) -> dict:
+        """Non-blocking counterpart of scrape_blog"""
+        try:
+            items = [item async for item in self.iter_blog_async(url, max_pages, max_concurrent,
+                                                                 incremental=incremental)]
+            return {
+                "team_id": team_id,
+                "items": [item.dict() for item in items]
+            }
+        except Exception as e:
+            logging.error(f"Blog scraping failed: {e}")
+            raise Exception(f"Failed to scrape blog: {e}")
+
     def scrape_blog(self, url: str, team_id: str = "aline123", max_pages: int = 50) -> dict:
         """Main blog scraping method"""
         try:
-            soup = self.get_page_content(url)
+            html = self.fetch_html(url)
             
-            # Find all blog post URLs
-            post_urls = self.find_blog_post_urls(url, soup)
+            # Find all blog post URLs, preferring feeds and sitemaps
+            post_urls = [item.url for item in self.discover_feed_urls(url, html)]
+            if not post_urls:
+                post_urls = self.find_blog_post_urls(url, html)
+            post_urls = unique_urls(post_urls)
             
             items = []
             
@@ -211,6 +341,9 @@ class BlogScraper:
                 post_urls = post_urls[:max_pages]
                 
                 for post_url in post_urls:
+                    if host_breaker.is_open(post_url):
+                        logging.warning(f"Circuit open for its host, skipped: {post_url}")
+                        continue
                     item = self.scrape_single_url(post_url)
                     if item:
                         items.append(item)
@@ -224,27 +357,45 @@ class BlogScraper:
             logging.error(f"Blog scraping failed: {e}")
             raise Exception(f"Failed to scrape blog: {e}")
 
+    def iter_pdf(self, url: str):
+        """Download a PDF to a temp file and yield its chunks as ScrapedItems"""
+        fd, path = tempfile.mkstemp(suffix=".pdf")
+        try:
+            with os.fdopen(fd, "wb") as spool, http_session.get(url, timeout=15, stream=True) as response:
+                response.raise_for_status()
+                for block in response.iter_content(chunk_size=1 << 16):
+                    spool.write(block)
+            yield from self.iter_pdf_file(path, "PDF Document", url)
+        finally:
+            os.unlink(path)
+
+    def iter_pdf_file(self, path: str, title: str, source_url: Optional[str] = None, max_chunks: int = 8):
+        """Yield the first max_chunks chunks of a PDF on disk as ScrapedItems.
+
+        Pages are laid out on the extraction pool and chunked as they arrive;
+        once max_chunks chunks are out, pages not yet started are cancelled.
+        """
+        pages = iter_pages(path, executor=get_executor(), pages_per_task=CONFIG['pdf_pages_per_task'])
+        chunks = chunk_pages(pages, max_chars=2000, overlap=0)
+        try:
+            for i, chunk in enumerate(islice(chunks, max_chunks)):  # First 8 chapters as requested
+                yield ScrapedItem(
+                    title=f"{title} - Chapter {i+1}",
+                    content=chunk.text,
+                    content_type="book",
+                    source_url=source_url,
+                    author="",
+                    page_start=chunk.first_page,
+                    page_end=chunk.last_page
+                )
+        finally:
+            chunks.close()
+            pages.close()
+
     def scrape_pdf(self, url: str, team_id: str = "aline123") -> dict:
         """Scrape PDF content"""
         try:
-            response = requests.get(url, timeout=15)
-            response.raise_for_status()
-            pdf_bytes = BytesIO(response.content)
-            text = extract_text(pdf_bytes)
-            
-            # Chunk the text for better processing
-            chunks = self.chunk_text(text)
-            
-            items = []
-            for i, chunk in enumerate(chunks[:8]):  # First 8 chapters as requested
-                items.append(ScrapedItem(
-                    title=f"PDF Document - Chapter {i+1}",
-                    content=chunk,
-                    content_type="book",
-                    source_url=url,
-                    author=""
-                ))
-            
+            items = list(self.iter_pdf(url))
             return {
                 "team_id": team_id,
                 "items": [item.dict() for item in items]
@@ -256,35 +407,284 @@ class BlogScraper:
 
     def chunk_text(self, text: str, chunk_size: int = 2000) -> List[str]:
         """Split text into chunks"""
-        words = text.split()
-        chunks = []
-        current_chunk = []
-        current_length = 0
-        
-        for word in words:
-            if current_length + len(word) + 1 > chunk_size and current_chunk:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = [word]
-                current_length = len(word)
-            else:
-                current_chunk.append(word)
-                current_length += len(word) + 1
-        
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
-        
-        return chunks
+        return list(iter_chunks(text, max_size=chunk_size))
 
 # Instantiate scraper
 scraper = BlogScraper()
 
+def _ndjson_line(record: dict) -> str:
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+async def stream_blog_ndjson(url: str, max_pages: int, max_concurrent: int, incremental: bool = False):
+    """NDJSON body for /scrape?stream=true: one ScrapedItem per line as posts finish.
+
+    Headers are already sent when a crawl fails mid-stream, so the failure
+    is reported as an {"error": ...} line instead of a 500. The last line
+    is always {"summary": {discovered, done, failed, unchanged}}.
+    """
+    stats = {}
+    try:
+        async for item in scraper.iter_blog_async(url, max_pages, max_concurrent, stats=stats,
+                                                  incremental=incremental):
+            yield _ndjson_line(item.dict())
+    except Exception as e:
+        logging.error(f"Streaming scrape failed: {e}")
+        yield _ndjson_line({"error": f"Scraping failed: {e}"})
+    yield _ndjson_line({"summary": stats})
+
+def stream_pdf_ndjson(url: str):
+    """NDJSON body for /scrape-pdf?stream=true (iterated in Starlette's threadpool)"""
+    try:
+        for item in scraper.iter_pdf(url):
+            yield _ndjson_line(item.dict())
+    except Exception as e:
+        logging.error(f"Streaming PDF scrape failed: {e}")
+        yield _ndjson_line({"error": f"PDF scraping failed: {e}"})
+
+# Uploaded PDFs: the multipart body is parsed as it arrives and the file
+# part written straight to disk, and at most CONFIG['pdf_workers'] are
+# extracted at once however many are uploaded.
+MULTIPART_SLACK = 1 << 16  # form boundaries and headers around the file
+max_upload_bytes = CONFIG['max_upload_mb'] * 1024 * 1024
+pdf_slots = asyncio.Semaphore(CONFIG['pdf_workers'])
+
+class _UploadPart:
+    """python-multipart callbacks that keep the bytes of the first "file" part only"""
+
+    def __init__(self):
+        self.filename = None
+        self.size = 0
+        self.blocks = []
+        self._writing = False
+        self._headers = {}
+        self._field = self._value = b""
+
+    def callbacks(self) -> dict:
+        return {name: getattr(self, name) for name in (
+            "on_part_begin", "on_header_field", "on_header_value", "on_header_end",
+            "on_headers_finished", "on_part_data", "on_part_end")}
+
+    def on_part_begin(self):
+        self._headers = {}
+
+    def on_header_field(self, data, start, end):
+        self._field += data[start:end]
+
+    def on_header_value(self, data, start, end):
+        self._value += data[start:end]
+
+    def on_header_end(self):
+        self._headers[self._field.lower()] = self._value
+        self._field = self._value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._writing = self.filename is None and options.get(b"name") == b"file" and b"filename" in options
+        if self._writing:
+            self.filename = options[b"filename"].decode("utf-8", "replace")
+            if not self.filename.endswith(".pdf"):
+                raise HTTPException(status_code=400, detail="File must be a PDF")
+
+    def on_part_data(self, data, start, end):
+        if self._writing:
+            self.size += end - start
+            if self.size > max_upload_bytes:
+                raise HTTPException(status_code=413, detail=f"PDF larger than {CONFIG['max_upload_mb']} MB")
+            self.blocks.append(data[start:end])
+
+    def on_part_end(self):
+        self._writing = False
+
+async def spool_upload(request: Request) -> Tuple[str, str]:
+    """Write a multipart upload's "file" part to a temp file; return (path, filename).
+
+    The body is parsed while it is received, so max_upload_mb is enforced
+    as bytes arrive (chunked uploads without a Content-Length included)
+    and the PDF is written to disk only once.
+    """
+    _, options = parse_options_header(request.headers.get("content-type", ""))
+    if b"boundary" not in options:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+    part = _UploadPart()
+    parser = MultipartParser(options[b"boundary"], part.callbacks())
+    fd, path = tempfile.mkstemp(suffix=".pdf", dir=CONFIG['upload_dir'])
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                spool.write(b"".join(part.blocks))
+                part.blocks.clear()
+        parser.finalize()
+        if part.filename is None:
+            raise HTTPException(status_code=400, detail="No file field in the upload")
+    except MultipartParseError as e:
+        remove_upload(path)
+        raise HTTPException(status_code=400, detail=f"Malformed multipart body: {e}")
+    except BaseException:
+        remove_upload(path)
+        raise
+    return path, part.filename
+
+def remove_upload(path: str):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+async def iter_pdf_upload(path: str, title: str):
+    """Yield a spooled PDF's chunks without blocking the event loop; the caller removes the file"""
+    items = scraper.iter_pdf_file(path, title)
+    try:
+        async with pdf_slots:
+            while (item := await asyncio.to_thread(next, items, None)) is not None:
+                yield item
+    finally:
+        items.close()
+
+async def stream_upload_ndjson(path: str, title: str):
+    """NDJSON body for /upload-pdf?stream=true"""
+    try:
+        async for item in iter_pdf_upload(path, title):
+            yield _ndjson_line(item.dict())
+    except Exception as e:
+        logging.error(f"Streaming PDF upload failed: {e}")
+        yield _ndjson_line({"error": f"PDF processing failed: {e}"})
+    finally:
+        # The response's background task also removes it if this never starts
+        remove_upload(path)
+
+# Extraction-pool entry points. Each worker process imports this module and
+# so gets its own warm BlogScraper; arguments and results stay picklable.
+def _extract_post(url: str, html: str, light: bool = False) -> Optional[dict]:
+    item = scraper.extract_from_html(url, html, light)
+    return item.dict() if item else None
+
+def _discover_posts(url: str, html: str) -> List[str]:
+    return scraper.find_blog_post_urls(url, html)
+
+# Background jobs: a bounded set of worker tasks drains job_queue, and all
+# job state lives in SQLite. A job runs only in the process that claims its
+# lease, so several uvicorn workers can share jobs_db. Shutdown hands running
+# jobs back to the queue; every job_poll_seconds each process queues the
+# jobs that are waiting or whose worker died (lease lapsed), and they resume
+# keeping the items they already stored.
+job_store = JobStore(CONFIG['jobs_db'], lease_seconds=CONFIG['job_lease_seconds'])
+job_queue: asyncio.Queue = asyncio.Queue()
+job_workers: List[asyncio.Task] = []
+# Job ids in job_queue or being run here, so polling does not queue them twice
+pending_jobs: set = set()
+
+def enqueue_job(job_id: str):
+    if job_id not in pending_jobs:
+        pending_jobs.add(job_id)
+        job_queue.put_nowait(job_id)
+
+async def iter_job_items(job_id: str, params: dict, stats: dict):
+    if params.get("pdf_path"):
+        # Chunks come out in the same order every run, so resume after the stored ones
+        stored = job_store.count_items(job_id)
+        stats.update(discovered=stored, done=stored, failed=0)
+        items = iter_pdf_upload(params["pdf_path"], params["filename"])
+        async for index, item in aenumerate(items):
+            if index < stored:
+                continue
+            stats["discovered"] += 1
+            stats["done"] += 1
+            yield item
+    else:
+        async for item in scraper.iter_blog_async(params["url"], params["max_pages"],
+                                                  params["concurrency"], stats=stats,
+                                                  skip_urls=job_store.done_urls(job_id)):
+            yield item
+
+async def aenumerate(items):
+    index = 0
+    async for item in items:
+        yield index, item
+        index += 1
+
+async def keep_lease(job_id: str):
+    """Renew the job's lease until cancelled; returns if another worker has taken the job"""
+    while True:
+        await asyncio.sleep(job_store.lease_seconds / 3)
+        if not await asyncio.to_thread(job_store.renew, job_id):
+            logging.warning(f"Lost the lease on job {job_id}")
+            return
+
+async def run_job(job_id: str):
+    if not job_store.claim(job_id):
+        logging.info(f"Job {job_id} is claimed by another worker or already finished")
+        return
+    params = job_store.get(job_id)["params"]
+    stats = {}
+    lease = asyncio.create_task(keep_lease(job_id))
+    try:
+        async for item in iter_job_items(job_id, params, stats):
+            if lease.done():
+                return
+            job_store.add_item(job_id, item.dict())
+            job_store.update_progress(job_id, stats["discovered"], stats["done"], stats["failed"])
+        job_store.update_progress(job_id, stats.get("discovered", 0), stats.get("done", 0), stats.get("failed", 0))
+        job_store.finish(job_id, SUCCEEDED)
+    except asyncio.CancelledError:
+        # Shutting down: release the lease so a restart resumes the job at once
+        job_store.release(job_id)
+        raise
+    except Exception as e:
+        logging.error(f"Job {job_id} failed: {e}")
+        job_store.finish(job_id, FAILED, error=str(e))
+    finally:
+        lease.cancel()
+    if params.get("pdf_path"):
+        remove_upload(params["pdf_path"])
+
+async def job_worker():
+    while True:
+        job_id = await job_queue.get()
+        try:
+            await run_job(job_id)
+        finally:
+            pending_jobs.discard(job_id)
+            job_queue.task_done()
+
+async def poll_jobs():
+    """Queue claimable jobs: new ones from other processes and ones whose worker died"""
+    while True:
+        try:
+            for job_id in await asyncio.to_thread(job_store.claimable):
+                enqueue_job(job_id)
+        except Exception as e:
+            logging.error(f"Polling for jobs failed: {e}")
+        await asyncio.sleep(CONFIG['job_poll_seconds'])
+
+@app.on_event("startup")
+async def start_job_workers():
+    job_workers.append(asyncio.create_task(poll_jobs()))
+    for _ in range(CONFIG['job_workers']):
+        job_workers.append(asyncio.create_task(job_worker()))
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    for task in job_workers:
+        task.cancel()
+    # Let cancelled jobs release their leases before the loop stops
+    await asyncio.gather(*job_workers, return_exceptions=True)
+    job_workers.clear()
+
+@app.on_event("shutdown")
+async def close_http_session():
+    await close_async_session()
+
 @app.get("/")
 async def root():
     return {
         "message": "Aline Scraper API v2.0 is running",
         "endpoints": {
             "scrape": "/scrape?url=<blog_url>&team_id=<team_id>",
+            "jobs": "POST /jobs?url=<blog_url>&team_id=<team_id>, GET /jobs/<job_id>, GET /jobs/<job_id>/results",
+            "upload_pdf": "POST /upload-pdf (multipart file; stream=true or background=true)",
             "health": "/health",
+            "metrics": "/metrics",
             "test": "/test"
         }
     }
@@ -293,14 +693,21 @@ async def root():
 async def scrape_endpoint(
     url: str = Query(..., description="URL to scrape"),
     team_id: str = Query("aline123", description="Team ID"),
-    max_pages: int = Query(50, description="Maximum pages to scrape")
+    max_pages: int = Query(50, description="Maximum pages to scrape"),
+    concurrency: int = Query(5, ge=1, le=20, description="Posts fetched in parallel"),
+    stream: bool = Query(False, description="Stream items as NDJSON while they are extracted"),
+    incremental: bool = Query(False, description="Only return posts that are new or changed since the last crawl")
 ):
     """Scrape content from a URL"""
     if not url:
         raise HTTPException(status_code=400, detail="URL parameter is required")
 
+    if stream:
+        return StreamingResponse(stream_blog_ndjson(url, max_pages, concurrency, incremental),
+                                 media_type="application/x-ndjson")
+
     try:
-        result = scraper.scrape_blog(url, team_id, max_pages)
+        result = await scraper.scrape_blog_async(url, team_id, max_pages, concurrency, incremental)
         return JSONResponse(content=result)
     except Exception as e:
         logging.error(f"Scraping error: {str(e)}")
@@ -313,12 +720,74 @@ async def scrape_endpoint(
             }
         )
 
+@app.post("/jobs", status_code=202)
+async def create_job(
+    url: str = Query(..., description="URL to scrape"),
+    team_id: str = Query("aline123", description="Team ID"),
+    max_pages: int = Query(50, description="Maximum pages to scrape"),
+    concurrency: int = Query(5, ge=1, le=20, description="Posts fetched in parallel")
+):
+    """Queue a background scrape and return its job id immediately"""
+    job_id = job_store.create({
+        "url": url,
+        "team_id": team_id,
+        "max_pages": max_pages,
+        "concurrency": concurrency
+    })
+    enqueue_job(job_id)
+    return {"job_id": job_id, "status": "queued"}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Job status and progress"""
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "url": job["params"].get("url"),
+        "filename": job["params"].get("filename"),
+        "team_id": job["params"]["team_id"],
+        "discovered": job["discovered"],
+        "done": job["done"],
+        "failed": job["failed"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"]
+    }
+
+@app.get("/jobs/{job_id}/results")
+async def get_job_results(
+    job_id: str,
+    offset: int = Query(0, ge=0, description="Index of the first item"),
+    limit: int = Query(20, ge=1, le=100, description="Items per page")
+):
+    """Items extracted so far, one page at a time"""
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    items = job_store.get_items(job_id, offset, limit)
+    total = job_store.count_items(job_id)
+    return {
+        "team_id": job["params"]["team_id"],
+        "status": job["status"],
+        "items": items,
+        "offset": offset,
+        "total": total,
+        "next_offset": offset + len(items) if offset + len(items) < total else None
+    }
+
 @app.get("/scrape-pdf")
 async def scrape_pdf_endpoint(
     url: str = Query(..., description="PDF URL to scrape"),
-    team_id: str = Query("aline123", description="Team ID")
+    team_id: str = Query("aline123", description="Team ID"),
+    stream: bool = Query(False, description="Stream chunks as NDJSON while they are extracted")
 ):
     """Scrape PDF content from URL"""
+    if stream:
+        return StreamingResponse(stream_pdf_ndjson(url), media_type="application/x-ndjson")
+
     try:
         result = scraper.scrape_pdf(url, team_id)
         return JSONResponse(content=result)
@@ -333,31 +802,37 @@ async def scrape_pdf_endpoint(
             }
         )
 
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """Refuse uploads whose Content-Length is over the limit before any of the body is read"""
+    if request.url.path == "/upload-pdf":
+        length = request.headers.get("content-length", "")
+        if length.isdigit() and int(length) > max_upload_bytes + MULTIPART_SLACK:
+            return JSONResponse(status_code=413,
+                                content={"detail": f"PDF larger than {CONFIG['max_upload_mb']} MB"})
+    return await call_next(request)
+
 @app.post("/upload-pdf")
 async def upload_pdf(
-    file: UploadFile = File(...),
-    team_id: str = "aline123"
+    request: Request,
+    team_id: str = "aline123",
+    stream: bool = Query(False, description="Stream chunks as NDJSON while pages are extracted"),
+    background: bool = Query(False, description="Queue extraction as a job and return its id")
 ):
-    """Upload and process PDF file"""
+    """Upload and process PDF file (multipart/form-data with a "file" field)"""
+    path, filename = await spool_upload(request)
+
+    if background:
+        job_id = job_store.create({"team_id": team_id, "filename": filename, "pdf_path": path})
+        enqueue_job(job_id)
+        return JSONResponse(status_code=202, content={"job_id": job_id, "status": "queued"})
+
+    if stream:
+        return StreamingResponse(stream_upload_ndjson(path, filename), media_type="application/x-ndjson",
+                                 background=BackgroundTask(remove_upload, path))
+
     try:
-        if not file.filename.endswith('.pdf'):
-            raise HTTPException(status_code=400, detail="File must be a PDF")
-        
-        content = await file.read()
-        text = extract_text(BytesIO(content))
-        
-        chunks = scraper.chunk_text(text)
-        
-        items = []
-        for i, chunk in enumerate(chunks[:8]):  # First 8 chapters
-            items.append(ScrapedItem(
-                title=f"{file.filename} - Chapter {i+1}",
-                content=chunk,
-                content_type="book",
-                source_url=None,
-                author=""
-            ))
-        
+        items = [item async for item in iter_pdf_upload(path, filename)]
         return JSONResponse(content={
             "team_id": team_id,
             "items": [item.dict() for item in items]
@@ -366,6 +841,17 @@ async def upload_pdf(
     except Exception as e:
         logging.error(f"PDF upload error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        remove_upload(path)
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Process counters since startup, plus circuit states and per-host concurrency limits"""
+    return {
+        **metrics.snapshot(),
+        "circuits": host_breaker.states(),
+        "concurrency_limits": host_concurrency.limits(),
+    }
 
 @app.get("/health")
 async def health_check():
@@ -388,8 +874,8 @@ async def test_endpoint():
     for url in test_urls:
         try:
             # Test URL discovery
-            soup = scraper.get_page_content(url)
-            post_urls = scraper.find_blog_post_urls(url, soup)
+            html = scraper.fetch_html(url)
+            post_urls = scraper.find_blog_post_urls(url, html)
             
             # Test content extraction on first URL
             sample_content = None
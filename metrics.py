@@ -0,0 +1,35 @@
+import threading
+from collections import defaultdict
+
+# In-process counters, exposed by the API at /metrics. Each counter is a
+# name plus an optional label (e.g. "prefilter" / "soft_404").
+_lock = threading.Lock()
+_counters = defaultdict(int)
+
+
+def inc(name, label=None, amount=1):
+    with _lock:
+        _counters[(name, label)] += amount
+
+
+def get(name, label=None):
+    with _lock:
+        return _counters.get((name, label), 0)
+
+
+def snapshot():
+    """{name: count} for unlabelled counters, {name: {label: count}} otherwise"""
+    result = {}
+    with _lock:
+        items = list(_counters.items())
+    for (name, label), value in sorted(items, key=lambda item: (item[0][0], str(item[0][1]))):
+        if label is None:
+            result[name] = value
+        else:
+            result.setdefault(name, {})[label] = value
+    return result
+
+
+def reset():
+    with _lock:
+        _counters.clear()
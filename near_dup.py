@@ -0,0 +1,95 @@
+import re
+import hashlib
+from collections import Counter
+
+try:
+    import xxhash
+    _hash64 = xxhash.xxh64_digest
+except ImportError:  # pragma: no cover - xxhash is in requirements.txt
+    def _hash64(data):
+        return hashlib.blake2b(data, digest_size=8).digest()
+
+BITS = 64
+_WORD = re.compile(r"\w+")
+
+
+def simhash(text, shingle_size=3):
+    """64-bit SimHash over word shingles.
+
+    Shingle hashes are concatenated into one bytes object so each of the 8
+    byte lanes can be tallied with Counter in C; bit votes are then summed per
+    distinct byte value instead of per shingle.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < shingle_size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+    data = b"".join(_hash64(s.encode("utf-8")) for s in shingles)
+
+    votes = [0] * BITS
+    for lane in range(8):
+        for value, count in Counter(data[lane::8]).items():
+            for bit in range(8):
+                if value >> bit & 1:
+                    votes[lane * 8 + bit] += count
+
+    half = len(shingles) / 2
+    fingerprint = 0
+    for position, vote in enumerate(votes):
+        if vote > half:
+            fingerprint |= 1 << position
+    return fingerprint
+
+
+def max_distance_for(threshold):
+    """Hamming distance allowed for a similarity threshold in [0, 1]"""
+    return int(round((1 - threshold) * BITS))
+
+
+class SimHashIndex:
+    """Banded LSH index of SimHash fingerprints.
+
+    Fingerprints are split into max_distance + 1 bands; by pigeonhole any two
+    fingerprints within max_distance bits agree exactly on at least one band,
+    so a lookup only compares against items sharing a band bucket.
+    """
+
+    def __init__(self, max_distance=3):
+        self.max_distance = max_distance
+        bands = max_distance + 1
+        width, extra = divmod(BITS, bands)
+        self._bands = []
+        start = 0
+        for i in range(bands):
+            size = width + (1 if i < extra else 0)
+            self._bands.append((start, (1 << size) - 1))
+            start += size
+        self._tables = [{} for _ in self._bands]
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _keys(self, fingerprint):
+        return [(fingerprint >> shift) & mask for shift, mask in self._bands]
+
+    def find(self, fingerprint):
+        """Return the key of a stored near-duplicate, or None"""
+        for table, band in zip(self._tables, self._keys(fingerprint)):
+            for other, key in table.get(band, ()):
+                if bin(fingerprint ^ other).count("1") <= self.max_distance:
+                    return key
+        return None
+
+    def add(self, fingerprint, key):
+        for table, band in zip(self._tables, self._keys(fingerprint)):
+            table.setdefault(band, []).append((fingerprint, key))
+        self._size += 1
+
+    def add_if_new(self, fingerprint, key):
+        """Store the fingerprint unless a near-duplicate exists; return that duplicate's key"""
+        existing = self.find(fingerprint)
+        if existing is None:
+            self.add(fingerprint, key)
+        return existing
@@ -0,0 +1,76 @@
+import os
+from collections import deque, namedtuple
+
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LTTextContainer
+from pdfminer.pdfpage import PDFPage
+
+from chunking import Chunker
+
+# first_page and last_page are 1-based and inclusive
+PDFChunk = namedtuple("PDFChunk", "text first_page last_page")
+
+
+def count_pages(path, max_pages=None):
+    """Number of pages, read from the page tree without interpreting any content"""
+    with open(path, "rb") as fp:
+        count = 0
+        for _ in PDFPage.get_pages(fp, maxpages=max_pages or 0):
+            count += 1
+        return count
+
+
+def _page_text(layout):
+    # One text box per paragraph, separated by a blank line
+    return "\n".join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+
+
+def extract_page_range(path, first, last):
+    """[(page_number, text), ...] for 0-based pages first..last-1; runs in pool workers"""
+    layouts = extract_pages(path, page_numbers=range(first, last), maxpages=last)
+    return [(first + i + 1, _page_text(layout)) for i, layout in enumerate(layouts)]
+
+
+def iter_pages(path, max_pages=None, executor=None, pages_per_task=8, max_in_flight=None):
+    """Yield (page_number, text) in page order, holding only a few pages at a time.
+
+    Without an executor pages are laid out one by one in this process. With
+    one, ranges of pages_per_task pages are fanned out to it and at most
+    max_in_flight ranges (default: CPU count) are pending at once, so memory
+    stays bounded however large the document is. Closing the generator
+    cancels ranges that have not started.
+    """
+    if executor is None:
+        for i, layout in enumerate(extract_pages(path, maxpages=max_pages or 0)):
+            yield i + 1, _page_text(layout)
+        return
+
+    total = count_pages(path, max_pages)
+    ranges = deque((start, min(start + pages_per_task, total)) for start in range(0, total, pages_per_task))
+    window = max_in_flight or os.cpu_count() or 1
+    pending = deque()
+    try:
+        while ranges or pending:
+            while ranges and len(pending) < window:
+                pending.append(executor.submit(extract_page_range, path, *ranges.popleft()))
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def chunk_pages(pages, max_chars=1500, overlap=200):
+    """Chunk (page_number, text) pairs into PDFChunks of at most max_chars.
+
+    A generator: each chunk is yielded as soon as it is full, so only the
+    current chunk and page are held.
+    """
+    chunker = Chunker(max_chars, overlap)
+    for page_number, text in pages:
+        # Join the lines of each text box back into one paragraph
+        text = "\n\n".join(" ".join(paragraph.split()) for paragraph in text.split("\n\n"))
+        for chunk in chunker.feed(text, page_number):
+            yield PDFChunk(*chunk)
+    last = chunker.flush()
+    if last:
+        yield PDFChunk(*last)
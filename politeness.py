@@ -0,0 +1,48 @@
+import asyncio
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class HostScheduler:
+    """Per-host politeness scheduler shared by the sync and async crawlers.
+
+    Each host is a token bucket holding one token that refills after a delay
+    drawn from `delay_for(url)` (a (min, max) tuple in seconds). A caller
+    reserves the host's next slot under a short lock and then sleeps outside
+    it, so requests to one host are spaced out while different hosts never
+    wait on each other.
+    """
+
+    def __init__(self, delay_for):
+        self.delay_for = delay_for
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def _reserve(self, url):
+        host = urlparse(url).netloc.lower()
+        low, high = self.delay_for(url)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + random.uniform(low, high)
+        return slot - now
+
+    def wait(self, url):
+        """Block until url's host may be fetched again"""
+        delay = self._reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def wait_async(self, url):
+        """Non-blocking variant of wait() for the event loop"""
+        delay = self._reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def reset(self):
+        with self._lock:
+            self._next_slot.clear()
@@ -0,0 +1,73 @@
+import re
+from collections import namedtuple
+
+import metrics
+
+# action is "extract" (run Goose), "light" (skip Goose, use the BeautifulSoup
+# paragraph extractor) or "reject"; reason says which check decided it
+Verdict = namedtuple("Verdict", "action reason")
+
+INVISIBLE = re.compile(r"<(script|style|template|svg)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+NOSCRIPT = re.compile(r"<noscript\b[^>]*>(.*?)</noscript\s*>", re.IGNORECASE | re.DOTALL)
+TAG = re.compile(r"<[^>]*>")
+TITLE = re.compile(r"<title\b[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+# Matched against each part of the title between separators ("Page not found | Blog")
+SOFT_404_TITLE = re.compile(
+    r"(?:error )?404(?: error)?(?: not found)?|(?:page )?not found|page (?:does not|doesn't) exist"
+    r"|nothing (?:was )?found|page no longer available",
+    re.IGNORECASE,
+)
+TITLE_SEPARATORS = re.compile(r"\s*[|:\u2013\u2014\u00b7\u2022-]\s*")
+LOGIN_WALL = re.compile(
+    r"(?:sign|log) ?in to (?:continue|read|view)|please (?:sign|log) ?in|subscribe to (?:continue|keep) reading",
+    re.IGNORECASE,
+)
+
+
+class Prefilter:
+    """Cheap checks on raw HTML, run before any parser.
+
+    Regexes drop scripts, styles and comments and strip tags to estimate the
+    visible text; from that come the visible length and the text density
+    (visible chars / HTML chars). Pages that are soft 404s, login walls,
+    noscript-only shells or nearly empty are rejected; pages with text but
+    very low density (mostly inline scripts/markup) go to the light
+    extractor instead of Goose. Every verdict is counted in metrics under
+    "prefilter".
+    """
+
+    def __init__(self, min_text_chars=200, min_text_density=0.01, login_wall_max_chars=1500):
+        self.min_text_chars = min_text_chars
+        self.min_text_density = min_text_density
+        self.login_wall_max_chars = login_wall_max_chars
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            min_text_chars=config['prefilter_min_text_chars'],
+            min_text_density=config['prefilter_min_text_density'],
+        )
+
+    def check(self, html):
+        verdict = self._check(html or "")
+        metrics.inc("prefilter", verdict.reason)
+        return verdict
+
+    def _check(self, html):
+        title = TITLE.search(html)
+        if title and any(SOFT_404_TITLE.fullmatch(part) for part in TITLE_SEPARATORS.split(title.group(1).strip())):
+            return Verdict("reject", "soft_404")
+
+        stripped = INVISIBLE.sub(" ", html)
+        noscript_chars = sum(len(" ".join(TAG.sub(" ", block).split())) for block in NOSCRIPT.findall(stripped))
+        text = " ".join(TAG.sub(" ", NOSCRIPT.sub(" ", stripped)).split())
+
+        if len(text) < self.min_text_chars:
+            if noscript_chars:
+                return Verdict("reject", "noscript_only")
+            return Verdict("reject", "too_little_text")
+        if len(text) <= self.login_wall_max_chars and LOGIN_WALL.search(text):
+            return Verdict("reject", "login_wall")
+        if len(text) / len(html) < self.min_text_density:
+            return Verdict("light", "low_text_density")
+        return Verdict("extract", "ok")
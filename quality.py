@@ -0,0 +1,67 @@
+import re
+from collections import namedtuple
+
+# score is 0..1 (1 = every check comfortably passed); reasons lists the
+# checks that failed, and any failure means the page should be skipped
+QualityReport = namedtuple("QualityReport", "score reasons")
+
+DEFAULT_NOISE_SIGNALS = ("javascript", "cookie", "advertising", "sign up", "subscribe")
+ANCHOR = re.compile(r"<a\b[^>]*>(.*?)</a\s*>", re.IGNORECASE | re.DOTALL)
+TAG = re.compile(r"<[^>]+>")
+
+
+class QualityScorer:
+    """Scores extracted article text before any markdown conversion.
+
+    The text is lowercased once; one compiled alternation then finds every
+    noise signal in a single scan, and one split gives the lexical diversity
+    (unique words / words). When the article's HTML is given, link density
+    (anchor text / text) and text-to-markup ratio come from one scan of it.
+    """
+
+    def __init__(self, noise_signals=DEFAULT_NOISE_SIGNALS, max_noise_signals=3, min_lexical_diversity=0.3,
+                 max_link_density=0.5, min_text_to_markup=0.05):
+        self._signals = re.compile("|".join(
+            re.escape(signal.lower()) for signal in sorted(noise_signals, key=len, reverse=True)
+        )) if noise_signals else None
+        self.max_noise_signals = max_noise_signals
+        self.min_lexical_diversity = min_lexical_diversity
+        self.max_link_density = max_link_density
+        self.min_text_to_markup = min_text_to_markup
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            noise_signals=config.get('noise_signals') or DEFAULT_NOISE_SIGNALS,
+            max_noise_signals=config['max_noise_signals'],
+            min_lexical_diversity=config['min_lexical_diversity'],
+            max_link_density=config['max_link_density'],
+            min_text_to_markup=config['min_text_to_markup'],
+        )
+
+    def score(self, text, html=None):
+        """QualityReport for article text, plus its HTML when available"""
+        lowered = text.lower()
+        words = lowered.split()
+        if not words:
+            return QualityReport(0.0, ["empty"])
+        # Each signal counts once however often it appears
+        signals = set(self._signals.findall(lowered)) if self._signals else set()
+
+        diversity = len(set(words)) / len(words)
+        failed = {
+            "noise_signals": len(signals) >= self.max_noise_signals,
+            "low_lexical_diversity": diversity < self.min_lexical_diversity,
+        }
+        scores = [1 - min(1.0, len(signals) / self.max_noise_signals), min(1.0, diversity / self.min_lexical_diversity)]
+
+        if html:
+            link_chars = sum(len(TAG.sub("", anchor)) for anchor in ANCHOR.findall(html))
+            link_density = min(1.0, link_chars / len(text))
+            text_to_markup = len(text) / len(html)
+            failed["link_heavy"] = link_density > self.max_link_density
+            failed["markup_heavy"] = text_to_markup < self.min_text_to_markup
+            scores.append(1 - link_density)
+            scores.append(min(1.0, text_to_markup / self.min_text_to_markup))
+
+        return QualityReport(sum(scores) / len(scores), [reason for reason, hit in failed.items() if hit])
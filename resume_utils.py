@@ -2,15 +2,42 @@
 import json
 import os
 
-def save_checkpoint(processed_urls, checkpoint_file="checkpoint.json"):
-    with open(checkpoint_file, 'w') as f:
-        json.dump({"processed": list(processed_urls)}, f)
-
-def load_checkpoint(checkpoint_file="checkpoint.json"):
+def _read_checkpoint(checkpoint_file):
     if not os.path.exists(checkpoint_file):
-        return set()
+        return {}
     try:
         with open(checkpoint_file, 'r') as f:
-            return set(json.load(f).get("processed", []))
+            return json.load(f)
     except Exception:
-        return set()
+        return {}
+
+def _write_checkpoint(data, checkpoint_file):
+    # Write to a temp file and rename so a crash never leaves half a checkpoint
+    tmp_file = f"{checkpoint_file}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_file, checkpoint_file)
+
+def save_checkpoint(processed_urls, checkpoint_file="checkpoint.json"):
+    data = _read_checkpoint(checkpoint_file)
+    data["processed"] = list(processed_urls)
+    _write_checkpoint(data, checkpoint_file)
+
+def load_checkpoint(checkpoint_file="checkpoint.json"):
+    return set(_read_checkpoint(checkpoint_file).get("processed", []))
+
+def load_url_records(checkpoint_file="checkpoint.json"):
+    """Per-URL {"lastmod", "etag", "content_hash"} from the last incremental crawl"""
+    return _read_checkpoint(checkpoint_file).get("records", {})
+
+def save_url_records(records, checkpoint_file="checkpoint.json"):
+    """Merge records into the checkpoint, keeping entries other crawls wrote meanwhile"""
+    data = _read_checkpoint(checkpoint_file)
+    merged = data.get("records", {})
+    merged.update(records)
+    data["records"] = merged
+    _write_checkpoint(data, checkpoint_file)
+
+def lastmod_unchanged(record, lastmod):
+    """True when a feed/sitemap lastmod matches the one recorded last time"""
+    return bool(record and lastmod and record.get("lastmod") == lastmod)
@@ -0,0 +1,162 @@
+import asyncio
+import re
+import threading
+import time
+import urllib.robotparser
+from urllib.parse import urlparse
+
+import structlog
+from requests.exceptions import RetryError
+
+logger = structlog.get_logger("SaveAlineScraper")
+
+
+def _robots_url(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+
+
+def _host_key(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+
+def _retry_status(error):
+    """The status a retrying session gave up on, from its RetryError.
+
+    urllib3 names it only in the message ("too many 503 error responses");
+    a message without one still means the server kept answering with a
+    retryable error, which is read as 503.
+    """
+    match = re.search(r"too many (\d{3}) error responses", str(error))
+    return int(match.group(1)) if match else 503
+
+
+def _build_parser(robots_url, status, text):
+    """Rules for a robots.txt response, following RobotFileParser.read() for HTTP errors.
+
+    401/403 and 5xx disallow everything (the stdlib never marks a 5xx file
+    as read, so can_fetch() refuses); other 4xx allow everything. An
+    unreachable robots.txt (status None) also allows everything, leaving
+    dead hosts to the fetch path's circuit breaker.
+    """
+    rp = urllib.robotparser.RobotFileParser(robots_url)
+    if status is not None and (status in (401, 403) or status >= 500):
+        rp.disallow_all = True
+    elif status is None or status >= 400:
+        rp.allow_all = True
+    else:
+        rp.parse(text.splitlines())
+    rp.modified()
+    return rp
+
+
+class RobotsCache:
+    """Parsed robots.txt rules per host, shared by the sync and async crawlers.
+
+    Entries expire after `ttl` seconds. Missing or unreachable robots.txt files
+    are remembered as "allow all", and 5xx answers as a temporary "disallow
+    all", for `negative_ttl` seconds so a failing host is not asked again for
+    every article. Concurrent lookups for the same host
+    wait on a single fetch.
+    """
+
+    def __init__(self, session=None, ttl=3600, negative_ttl=600, timeout=10,
+                 user_agent="Mozilla/5.0 (compatible; SaveAlineBot/1.0)"):
+        self.session = session
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.fetches = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._host_locks = {}
+        self._pending = {}
+
+    def _get_fresh(self, host):
+        entry = self._entries.get(host)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _store(self, host, robots_url, status, text):
+        rp = _build_parser(robots_url, status, text)
+        negative = status is None or status >= 400
+        ttl = self.negative_ttl if negative else self.ttl
+        self._entries[host] = (time.monotonic() + ttl, rp)
+        self.fetches += 1
+        logger.info(f"Cached robots.txt for {host} (status={status}, ttl={ttl}s)")
+        return rp
+
+    def get(self, url):
+        """Return the RobotFileParser for url's host, fetching it at most once per TTL"""
+        host = _host_key(url)
+        rp = self._get_fresh(host)
+        if rp is not None:
+            return rp
+
+        with self._lock:
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+        with host_lock:
+            rp = self._get_fresh(host)
+            if rp is not None:
+                return rp
+            robots_url = _robots_url(url)
+            status, text = None, ""
+            try:
+                response = self.session.get(robots_url, headers={"User-Agent": self.user_agent},
+                                            timeout=self.timeout)
+                status, text = response.status_code, response.text
+            except RetryError as e:
+                # The session retried 429/5xx answers until it ran out of attempts
+                status = _retry_status(e)
+                logger.warning(f"robots.txt kept failing for {host}: {e}")
+            except Exception as e:
+                logger.warning(f"robots.txt fetch failed for {host}: {e}")
+            return self._store(host, robots_url, status, text)
+
+    async def get_async(self, session, url):
+        """Async variant of get(); session is an aiohttp.ClientSession"""
+        host = _host_key(url)
+        rp = self._get_fresh(host)
+        if rp is not None:
+            return rp
+
+        pending = self._pending.get(host)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_async(session, host, _robots_url(url)))
+            self._pending[host] = pending
+            pending.add_done_callback(lambda done: self._forget(host, done))
+        return await asyncio.shield(pending)
+
+    def _forget(self, host, done):
+        if self._pending.get(host) is done:
+            del self._pending[host]
+
+    async def _fetch_async(self, session, host, robots_url):
+        status, text = None, ""
+        try:
+            async with session.get(robots_url, headers={"User-Agent": self.user_agent},
+                                   timeout=self.timeout) as response:
+                status = response.status
+                text = await response.text()
+        except Exception as e:
+            logger.warning(f"robots.txt fetch failed for {host}: {e}")
+        return self._store(host, robots_url, status, text)
+
+    def can_fetch(self, url, user_agent="*"):
+        try:
+            return self.get(url).can_fetch(user_agent, url)
+        except Exception:
+            return True
+
+    async def can_fetch_async(self, session, url, user_agent="*"):
+        try:
+            rp = await self.get_async(session, url)
+            return rp.can_fetch(user_agent, url)
+        except Exception:
+            return True
+
+    def clear(self):
+        self._entries.clear()